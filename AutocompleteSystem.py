@@ -1,54 +1,1138 @@
+import gc
 import heapq
+import math
+import mmap
+import random
+import struct
+import sys
+import threading
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_left, insort
 from collections import defaultdict
+from contextlib import contextmanager
 
 class TrieNode:
     def __init__(self):
         self.children = {}
-        self.freq_map = defaultdict(int)  # word -> frequency
+        self.freq_map = defaultdict(int)  # word -> frequency (score when decaying)
         self.is_end = False
+        self.top = []  # best-first (-freq, word), at most k entries; in freq_map
+                       # mode filled on demand by input_fuzzy, None when stale
+
+LN2 = math.log(2)
+
 
 class AutocompleteSystem:
-    def __init__(self):
+    def __init__(self, k=3, cached=False, verbose=True, half_life=None, clock=time.time):
+        """
+        k: number of suggestions returned by input()
+        cached: keep a ranked top-k list on every node so input() never
+                has to look at the whole subtree (add_word then rejects
+                negative frequencies, which could push a word out of order)
+        verbose: print a line for every add_word call
+        half_life: if set, every hit loses half its weight after this many
+                   clock units, so stale words drop out of the suggestions
+        clock: time source used for decay when add_word gets no timestamp
+        """
         self.root = TrieNode()
+        self.k = k
+        self.cached = cached
+        self.verbose = verbose
+        self.freqs = {}  # word -> total frequency (cached mode)
+        self.half_life = half_life
+        self.clock = clock
+        # Forward decay: a hit of weight f at time t is stored as
+        # log(f) + (t - epoch) * ln2 / half_life. Decaying "now" divides every
+        # score by the same factor, so rankings (and the cached lists) never
+        # change as time passes and nothing has to be rescanned.
+        self.epoch = clock() if half_life is not None else 0.0
 
-    def add_word(self, word, freq=1):
+    def _bump(self, old, freq, timestamp=None):
+        """Combine a stored score with a new hit of weight freq."""
+        if self.half_life is None:
+            return (old or 0) + freq
+        if freq <= 0:
+            raise ValueError("Decaying frequencies need a positive weight")
+        if timestamp is None:
+            timestamp = self.clock()
+        hit = math.log(freq) + (timestamp - self.epoch) * LN2 / self.half_life
+        if old is None:
+            return hit
+        high, low = max(old, hit), min(old, hit)
+        return high + math.log1p(math.exp(low - high))
+
+    def _current(self, score, now=None):
+        """Turn a stored score into the frequency it is worth at time now."""
+        if self.half_life is None:
+            return score
+        if now is None:
+            now = self.clock()
+        return math.exp(score - (now - self.epoch) * LN2 / self.half_life)
+
+    def frequency(self, word, now=None):
+        """Current (decayed) frequency of word, 0 if it was never added."""
+        if self.cached:
+            score = self.freqs.get(word)
+        else:
+            node = self.root
+            for char in word:
+                node = node.children.get(char)
+                if node is None:
+                    return 0
+            score = node.freq_map.get(word) if node.is_end else None
+        return 0 if score is None else self._current(score, now)
+
+    def add_word(self, word, freq=1, timestamp=None):
         """Add or update a word with given frequency"""
+        if self.cached:
+            self._add_cached(word, freq, timestamp)
+        else:
+            path = []
+            node = self.root
+            for char in word:
+                if char not in node.children:
+                    node.children[char] = TrieNode()
+                node = node.children[char]
+                path.append(node)
+            node.is_end = True
+            if path:
+                new = self._bump(path[0].freq_map.get(word), freq, timestamp)
+                for node in path:
+                    node.freq_map[word] = new
+                    node.top = None
+        if self.verbose:
+            print(f"Added/Updated word '{word}' with frequency {freq}")
+
+    def _add_cached(self, word, freq, timestamp=None):
+        if freq < 0:
+            raise ValueError("Cached mode only supports non-negative frequency updates")
+        old = self.freqs.get(word)
+        new = self._bump(old, freq, timestamp)
+        self.freqs[word] = new
+        old_entry = None if old is None else (-old, word)
+        new_entry = (-new, word)
+
         node = self.root
         for char in word:
             if char not in node.children:
                 node.children[char] = TrieNode()
             node = node.children[char]
-            node.freq_map[word] += freq
+            self._update_top(node.top, old_entry, new_entry)
         node.is_end = True
-        print(f"Added/Updated word '{word}' with frequency {freq}")
+
+    def _update_top(self, top, old_entry, new_entry):
+        """Move a word's entry inside one node's ranked list, O(k)."""
+        if old_entry is not None:
+            i = bisect_left(top, old_entry)
+            if i < len(top) and top[i] == old_entry:
+                del top[i]
+                insort(top, new_entry)
+                return
+        if len(top) < self.k:
+            insort(top, new_entry)
+        elif new_entry < top[-1]:
+            top.pop()
+            insort(top, new_entry)
+
+    def bulk_load(self, items):
+        """Insert many (word, freq) pairs at once, in sorted order and without printing."""
+        with _gc_paused():
+            self._bulk_load(_aggregate(items))
+
+    def _bulk_load(self, totals):
+        # On an empty trie the sorted walk finishes each subtree before leaving
+        # it, so cached lists can be built as nodes are popped off the stack.
+        close_on_pop = self.cached and not self.root.children
+        now = self.clock() if self.half_life is not None else None
+        stack = [self.root]
+        prev = ""
+        for word in sorted(totals):
+            common = _common_prefix_len(prev, word)
+            if close_on_pop:
+                for node in reversed(stack[common + 1:]):
+                    self._close(node)
+            del stack[common + 1:]
+            node = stack[-1]
+            for char in word[common:]:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = TrieNode()
+                node = child
+                stack.append(node)
+            node.is_end = True
+            if self.cached:
+                score = self.freqs[word] = self._bump(self.freqs.get(word), totals[word], now)
+                node.top = [(-score, word)]  # own entry, merged with the children later
+            elif len(stack) > 1:
+                score = self._bump(stack[1].freq_map.get(word), totals[word], now)
+                for visited in stack[1:]:
+                    visited.freq_map[word] = score
+                    visited.top = None
+            prev = word
+        if close_on_pop:
+            for node in reversed(stack[1:]):
+                self._close(node)
+            self.root.top = []
+        elif self.cached:
+            self._rebuild_tops()
+
+    def _close(self, node):
+        """Fill node.top from its own entry (if any) and its finished children."""
+        children = node.children
+        if not node.is_end and len(children) == 1:
+            for child in children.values():
+                node.top = child.top[:]
+            return
+        candidates = node.top if node.is_end else []
+        for child in children.values():
+            candidates.extend(child.top)
+        node.top = heapq.nsmallest(self.k, candidates)
+
+    def _rebuild_tops(self):
+        """Recompute every cached top-k list bottom-up from self.freqs."""
+        order = []
+        todo = [(self.root, "")]
+        while todo:
+            node, word = todo.pop()
+            order.append(node)
+            node.top = [(-self.freqs[word], word)] if node.is_end and word in self.freqs else []
+            for char, child in node.children.items():
+                todo.append((child, word + char))
+        for node in reversed(order):
+            self._close(node)
+        self.root.top = []
+
+    def items(self):
+        """Yield every (word, freq) pair stored in the trie, with decay applied."""
+        now = self.clock() if self.half_life is not None else None
+        if self.cached:
+            for word, score in self.freqs.items():
+                yield word, self._current(score, now)
+            return
+        todo = [(self.root, "")]
+        while todo:
+            node, word = todo.pop()
+            if node.is_end and word:
+                yield word, self._current(node.freq_map[word], now)
+            for char, child in node.children.items():
+                todo.append((child, word + char))
 
     def input(self, prefix):
-        """Return top 3 most frequent words with given prefix"""
+        """Return top k most frequent words with given prefix"""
         node = self.root
         for char in prefix:
             if char not in node.children:
                 return []
             node = node.children[char]
-        
-        # use max heap to get top 3
+
+        if self.cached:
+            return [word for _, word in node.top]
+
+        # use max heap to get top k
         heap = [(-freq, word) for word, freq in node.freq_map.items()]
         heapq.heapify(heap)
         suggestions = []
-        for _ in range(min(3, len(heap))):
+        for _ in range(min(self.k, len(heap))):
             freq, word = heapq.heappop(heap)
             suggestions.append(word)
         return suggestions
 
+    def input_fuzzy(self, prefix, max_dist=1):
+        """Return top k most frequent words whose prefix is within max_dist edits of prefix."""
+        return _trie_fuzzy(self.root, prefix, max_dist, self.k, self._ranked)
+
+    def _ranked(self, node):
+        if node.top is None:
+            # freq_map mode: rank the subtree once and keep it until the next
+            # add_word through this node, so repeated queries stay cheap
+            node.top = heapq.nsmallest(self.k, ((-freq, word) for word, freq in node.freq_map.items()))
+        return node.top
+
+
+class RadixNode:
+    # The edge label is words[edge_word][edge_start:edge_end], so labels
+    # never copy characters out of the word table.
+    __slots__ = ("edge_word", "edge_start", "edge_end", "children", "word_id", "top")
+
+    def __init__(self, edge_word, edge_start, edge_end):
+        self.edge_word = edge_word
+        self.edge_start = edge_start
+        self.edge_end = edge_end
+        self.children = None  # first char -> RadixNode, None for leaves
+        self.word_id = -1     # id of the word ending here, -1 if none
+        self.top = ()         # best-first word ids, at most k
+
+
+class RadixAutocompleteSystem:
+    """Path-compressed trie with the same add_word/input API as AutocompleteSystem.
+
+    Every word is stored once in self.words; nodes only hold integer ids
+    and offsets into that table, plus a cached top-k tuple of word ids.
+    On 500k synthetic words (--memory --words 500000) that is ~294 traced
+    bytes per word, against ~1690 for the freq_map trie and ~1590 cached.
+    """
+
+    def __init__(self, k=3, verbose=True):
+        self.root = RadixNode(-1, 0, 0)
+        self.k = k
+        self.verbose = verbose
+        self.words = []  # word id -> word
+        self.freqs = []  # word id -> frequency
+
+    def _rank(self, word_id):
+        return (-self.freqs[word_id], self.words[word_id])
+
+    def _update_top(self, node, word_id):
+        key = self._rank(word_id)
+        top = [w for w in node.top if w != word_id]
+        if len(top) >= self.k and key >= self._rank(top[-1]):
+            return
+        i = 0
+        while i < len(top) and self._rank(top[i]) < key:
+            i += 1
+        top.insert(i, word_id)
+        node.top = tuple(top[:self.k])
+
+    def _insert(self, word):
+        """Make sure word has a node; return (node, nodes on the path below the root)."""
+        words = self.words
+        path = []
+        node = self.root
+        i = 0
+        while i < len(word):
+            child = node.children.get(word[i]) if node.children else None
+            if child is None:
+                # the word is appended to self.words right after this leaf is made
+                child = RadixNode(len(words), i, len(word))
+                if node.children is None:
+                    node.children = {}
+                node.children[word[i]] = child
+                node = child
+                path.append(node)
+                break
+
+            label = words[child.edge_word]
+            start, end = child.edge_start, child.edge_end
+            j = 0
+            while start + j < end and i + j < len(word) and label[start + j] == word[i + j]:
+                j += 1
+            if start + j < end:
+                # split the edge: node -> mid -> child
+                mid = RadixNode(child.edge_word, start, start + j)
+                mid.children = {label[start + j]: child}
+                mid.top = child.top
+                child.edge_start = start + j
+                node.children[word[i]] = mid
+                child = mid
+            node = child
+            path.append(node)
+            i += j
+
+        if node.word_id == -1:
+            node.word_id = len(words)
+            words.append(word)
+            self.freqs.append(0)
+        return node, path
+
+    def add_word(self, word, freq=1):
+        """Add or update a word with given frequency"""
+        if freq < 0:
+            # the cached tuples only ever move an updated word up
+            raise ValueError("Frequency updates must be non-negative")
+        node, path = self._insert(word)
+        self.freqs[node.word_id] += freq
+        for visited in path:
+            self._update_top(visited, node.word_id)
+        if self.verbose:
+            print(f"Added/Updated word '{word}' with frequency {freq}")
+
+    def bulk_load(self, items):
+        """Insert many (word, freq) pairs at once, in sorted order and without printing."""
+        with _gc_paused():
+            for word, freq in sorted(_aggregate(items).items()):
+                node, _ = self._insert(word)
+                self.freqs[node.word_id] += freq
+            self._rebuild_tops()
+
+    def _rebuild_tops(self):
+        """Recompute every cached top-k tuple bottom-up from self.freqs."""
+        order = []
+        todo = [self.root]
+        while todo:
+            node = todo.pop()
+            order.append(node)
+            if node.children:
+                todo.extend(node.children.values())
+        for node in reversed(order):
+            candidates = [w for child in (node.children or {}).values() for w in child.top]
+            if node.word_id != -1:
+                candidates.append(node.word_id)
+            node.top = tuple(heapq.nsmallest(self.k, candidates, key=self._rank))
+        self.root.top = ()
+
+    def items(self):
+        """Yield every (word, freq) pair stored in the trie."""
+        return zip(self.words, self.freqs)
+
+    def _find(self, prefix):
+        """Return the node whose subtree holds exactly the words starting with prefix."""
+        node = self.root
+        i = 0
+        while i < len(prefix):
+            child = node.children.get(prefix[i]) if node.children else None
+            if child is None:
+                return None
+            start, end = child.edge_start, child.edge_end
+            rest = prefix[i:i + end - start]
+            if not self.words[child.edge_word].startswith(rest, start, end):
+                return None
+            i += end - start
+            node = child
+        return node
+
+    def input_fuzzy(self, prefix, max_dist=1):
+        """Return top k most frequent words whose prefix is within max_dist edits of prefix."""
+        if not prefix:
+            return []  # like input("")
+        if len(prefix) <= max_dist:
+            start = [(child, None) for child in (self.root.children or {}).values()]
+        else:
+            start = [(self.root, list(range(len(prefix) + 1)))]
+        words = self.words
+        results = []
+        todo = start
+        while todo:
+            node, row = todo.pop()
+            if row is None:
+                for word_id in node.top:
+                    if not _offer(results, self.k, -self.freqs[word_id], words[word_id]):
+                        break
+                continue
+            children = []
+            for _, child in _viable_children(node.children or {}, row, prefix, max_dist):
+                if not _may_improve(results, self.k, self._best(child)):
+                    continue
+                label = words[child.edge_word]
+                child_row = row
+                for pos in range(child.edge_start, child.edge_end):
+                    child_row = _next_row(child_row, prefix, label[pos])
+                    if child_row[-1] <= max_dist:
+                        child_row = None  # the whole subtree matches
+                        break
+                    if min(child_row) > max_dist:
+                        break
+                if child_row is None or min(child_row) <= max_dist:
+                    children.append((child, child_row))
+            children.sort(key=lambda item: self._best(item[0]), reverse=True)
+            todo.extend(children)
+        return _finish(results)
+
+    def _best(self, node):
+        if not node.top:
+            return None
+        return self._rank(node.top[0])
+
+    def input(self, prefix):
+        """Return top k most frequent words with given prefix"""
+        node = self._find(prefix)
+        if node is None or node is self.root:
+            return []
+        return [self.words[word_id] for word_id in node.top]
+
+
+# 🔹 Fuzzy matching helpers
+def _next_row(row, query, char):
+    """Extend the edit-distance DP row between query prefixes and the trie path by char."""
+    new_row = [row[0] + 1]
+    for i in range(1, len(row)):
+        new_row.append(min(row[i] + 1, new_row[i - 1] + 1,
+                           row[i - 1] + (query[i - 1] != char)))
+    return new_row
+
+
+def _viable_children(children, row, query, max_dist):
+    """Yield the (char, child) pairs that can keep the edit distance within budget.
+
+    Once every cell of the row has used up the budget, the only way forward
+    is a free diagonal step, so just the chars query[i - 1] with
+    row[i - 1] == max_dist need looking up instead of every child.
+    """
+    if min(row) < max_dist:
+        return children.items()
+    chars = {query[i - 1] for i in range(1, len(row)) if row[i - 1] <= max_dist}
+    return [(char, children[char]) for char in chars if char in children]
+
+
+def _trie_fuzzy(root, prefix, max_dist, k, ranked):
+    """input_fuzzy over a char-per-node trie; ranked(node) gives its subtree's best-first (-freq, word) list."""
+    if not prefix:
+        return []  # like input("")
+
+    def best(node):
+        entries = ranked(node)
+        return entries[0] if entries else None
+
+    if len(prefix) <= max_dist:
+        start = [(child, None) for child in root.children.values()]
+    else:
+        start = [(root, list(range(len(prefix) + 1)))]
+    results = []  # min-heap of (freq, negated word order) holding the best k so far
+    todo = start
+    while todo:
+        node, row = todo.pop()
+        if row is not None and row[-1] <= max_dist:
+            row = None  # the whole subtree matches
+        if row is None:
+            for neg_freq, word in ranked(node):
+                if not _offer(results, k, neg_freq, word):
+                    break
+            continue
+        children = []
+        for char, child in _viable_children(node.children, row, prefix, max_dist):
+            if not _may_improve(results, k, best(child)):
+                continue
+            new_row = _next_row(row, prefix, char)
+            if min(new_row) <= max_dist:
+                children.append((child, new_row))
+        # visit the most promising subtree first so the bound tightens early
+        children.sort(key=lambda item: best(item[0]), reverse=True)
+        todo.extend(children)
+    return _finish(results)
+
+
+def _offer(results, k, neg_freq, word):
+    """Keep the k best (neg_freq, word) entries; False once entry can no longer get in."""
+    entry = (-neg_freq, _Reversed(word))
+    if len(results) < k:
+        heapq.heappush(results, entry)
+        return True
+    if entry > results[0]:
+        heapq.heapreplace(results, entry)
+        return True
+    return False
+
+
+def _may_improve(results, k, best):
+    """Branch-and-bound check: can a subtree whose best entry is `best` still place?"""
+    if best is None:
+        return False
+    return len(results) < k or (-best[0], _Reversed(best[1])) > results[0]
+
+
+def _finish(results):
+    return [entry[1].word for entry in sorted(results, reverse=True)]
+
+
+class _Reversed:
+    """Wraps a word so that min-heaps order ties by descending word."""
+    __slots__ = ("word",)
+
+    def __init__(self, word):
+        self.word = word
+
+    def __lt__(self, other):
+        return self.word > other.word
+
+    def __gt__(self, other):
+        return self.word < other.word
+
+    def __eq__(self, other):
+        return self.word == other.word
+
+
+def _aggregate(items):
+    totals = {}
+    for word, freq in items:
+        totals[word] = totals.get(word, 0) + freq
+    return totals
+
+
+@contextmanager
+def _gc_paused():
+    """Skip cyclic GC passes while allocating millions of acyclic nodes."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _common_prefix_len(a, b):
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+# 🔹 Binary snapshots
+#
+# A snapshot is a byte-level radix trie over the UTF-8 encoded words, laid
+# out as flat arrays so it can be mmap'ed and queried without rebuilding:
+#
+#   header   magic, byte order, k, node count, word count, blob length
+#   freqs    double[words]      frequency of each word (words sorted by bytes)
+#   word_off uint64[words + 1]  word i is blob[word_off[i]:word_off[i + 1]]
+#   edge_off uint64[nodes]      edge label of node is blob[edge_off:edge_off + edge_len]
+#   edge_len uint32[nodes]
+#   child    uint32[nodes]      index of the first child; children are contiguous
+#   nchild   uint32[nodes]      and sorted by the first byte of their edge label
+#   word     int32[nodes]       word id ending at this node, -1 if none
+#   top      int32[nodes * k]   best-first word ids, padded with -1
+#   blob     bytes              concatenated words
+
+SNAPSHOT_MAGIC = b"ACSNAP01"
+_HEADER = struct.Struct("<8sBxxxIIIQ")
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def save_snapshot(system, path):
+    """Write any backend's (word, freq) pairs to a binary snapshot file."""
+    totals = _aggregate(system.items())
+    entries = sorted((word.encode("utf-8"), freq) for word, freq in totals.items() if word)
+    k = system.k
+
+    blob = bytearray()
+    word_off = array("Q", [0])
+    freqs = array("d")
+    for word, freq in entries:
+        blob += word
+        word_off.append(len(blob))
+        freqs.append(freq)
+
+    def rank(word_id):
+        return (-freqs[word_id], word_id)  # ids follow byte order, so ties break by word
+
+    # nodes[i] = [edge_off, edge_len, children, word_id, top]
+    nodes = []
+
+    def build(lo, hi, depth, edge_off, edge_len):
+        node = [edge_off, edge_len, [], -1, []]
+        nodes.append(node)
+        start = lo
+        if start < hi and word_off[start + 1] - word_off[start] == depth:
+            node[3] = start
+            start += 1
+        while start < hi:
+            byte = blob[word_off[start] + depth]
+            end = start + 1
+            while end < hi and blob[word_off[end] + depth] == byte:
+                end += 1
+            first = blob[word_off[start]:word_off[start + 1]]
+            last = blob[word_off[end - 1]:word_off[end]]
+            common = _common_prefix_len(first, last)
+            node[2].append(build(start, end, common, word_off[start] + depth, common - depth))
+            start = end
+        candidates = [w for child in node[2] for w in child[4]]
+        if node[3] != -1:
+            candidates.append(node[3])
+        node[4] = heapq.nsmallest(k, candidates, key=rank)
+        return node
+
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 10_000))
+    try:
+        with _gc_paused():
+            root = build(0, len(entries), 0, 0, 0)
+    finally:
+        sys.setrecursionlimit(limit)
+
+    # breadth-first numbering keeps every node's children contiguous
+    order = [root]
+    first_child = []
+    for node in order:
+        first_child.append(len(order))
+        order.extend(node[2])
+    edge_off = array("Q", (node[0] for node in order))
+    edge_len = array("I", (node[1] for node in order))
+    child = array("I", first_child)
+    nchild = array("I", (len(node[2]) for node in order))
+    word = array("i", (node[3] for node in order))
+    top = array("i")
+    for node in order:
+        top.extend(node[4] + [-1] * (k - len(node[4])))
+
+    byteorder = 0 if sys.byteorder == "little" else 1
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, byteorder, k, len(order), len(entries), len(blob)))
+        for section in (freqs, word_off, edge_off, edge_len, child, nchild, word, top, blob):
+            f.write(b"\0" * (_align(f.tell()) - f.tell()))
+            f.write(section)
+
+
+class SnapshotAutocomplete:
+    """Read-only autocomplete answered straight from an mmap'ed snapshot file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mm)
+        magic, byteorder, self.k, nodes, words, blob_len = _HEADER.unpack_from(view)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not an autocomplete snapshot")
+        if byteorder != (0 if sys.byteorder == "little" else 1):
+            raise ValueError(f"{path} was written on a machine with a different byte order")
+
+        offset = _HEADER.size
+        sections = []
+        for fmt, count in (("d", words), ("Q", words + 1), ("Q", nodes), ("I", nodes),
+                           ("I", nodes), ("I", nodes), ("i", nodes), ("i", nodes * self.k),
+                           ("B", blob_len)):
+            offset = _align(offset)
+            size = count * struct.calcsize(fmt)
+            sections.append(view[offset:offset + size].cast(fmt))
+            offset += size
+        (self._freqs, self._word_off, self._edge_off, self._edge_len, self._child,
+         self._nchild, self._node_word, self._top, self._blob) = sections
+        self._views = [view] + sections
+
+    def _word(self, word_id):
+        return bytes(self._blob[self._word_off[word_id]:self._word_off[word_id + 1]]).decode("utf-8")
+
+    def __len__(self):
+        return len(self._freqs)
+
+    def input(self, prefix):
+        """Return top k most frequent words with given prefix"""
+        key = prefix.encode("utf-8")
+        blob, edge_off = self._blob, self._edge_off
+        node = 0
+        i = 0
+        while i < len(key):
+            lo = self._child[node]
+            hi = lo + self._nchild[node]
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if blob[edge_off[mid]] < key[i]:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo == self._child[node] + self._nchild[node] or blob[edge_off[lo]] != key[i]:
+                return []
+            n = min(self._edge_len[lo], len(key) - i)
+            if blob[edge_off[lo]:edge_off[lo] + n] != key[i:i + n]:
+                return []
+            i += n
+            node = lo
+        if node == 0:
+            return []
+        ids = self._top[node * self.k:(node + 1) * self.k]
+        return [self._word(word_id) for word_id in ids if word_id >= 0]
+
+    def items(self):
+        """Yield every (word, freq) pair in the snapshot."""
+        for word_id in range(len(self._freqs)):
+            yield self._word(word_id), self._freqs[word_id]
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_snapshot(path):
+    """Open a snapshot written by save_snapshot for querying."""
+    return SnapshotAutocomplete(path)
+
+
+# 🔹 Concurrent, snapshot-based autocomplete
+class FrozenNode:
+    # Never mutated once reachable from a published root.
+    __slots__ = ("children", "top", "freq")
+
+    def __init__(self, children=None, top=(), freq=0):
+        self.children = children if children is not None else {}
+        self.top = top    # best-first (-freq, word), at most k
+        self.freq = freq  # frequency of the word ending here, 0 if none
+
+
+class ConcurrentAutocompleteSystem:
+    """Autocomplete where readers never take a lock.
+
+    Readers grab the current root and walk an immutable trie. Writers queue
+    updates; every batch_size distinct words (or on flush()) a new version
+    is built by copying only the nodes on touched paths, then published with
+    a single reference assignment. Queries see a batch all-or-nothing.
+    """
+
+    def __init__(self, k=3, batch_size=1000, verbose=False):
+        self.k = k
+        self.batch_size = batch_size
+        self.verbose = verbose
+        self.version = 0
+        self._root = FrozenNode()
+        self._pending = {}  # word -> frequency increment not yet published
+        self._write_lock = threading.Lock()
+
+    def add_word(self, word, freq=1):
+        """Queue a frequency update; it becomes visible with the next published batch."""
+        if freq < 0:
+            # _apply only re-ranks updated words upwards against the old top lists
+            raise ValueError("Frequency updates must be non-negative")
+        with self._write_lock:
+            self._pending[word] = self._pending.get(word, 0) + freq
+            if len(self._pending) >= self.batch_size:
+                self._publish()
+        if self.verbose:
+            print(f"Added/Updated word '{word}' with frequency {freq}")
+
+    def bulk_load(self, items):
+        """Apply many (word, freq) pairs as a single new version."""
+        items = list(items)
+        if any(freq < 0 for _, freq in items):
+            raise ValueError("Frequency updates must be non-negative")
+        with self._write_lock:
+            for word, freq in items:
+                self._pending[word] = self._pending.get(word, 0) + freq
+            self._publish()
+
+    def flush(self):
+        """Publish any queued updates now."""
+        with self._write_lock:
+            self._publish()
+
+    def _publish(self):
+        if not self._pending:
+            return
+        updates = sorted(self._pending.items())
+        self._pending = {}
+        root = self._apply(self._root, updates, 0)
+        root.top = ()
+        self._root = root
+        self.version += 1
+
+    def _apply(self, node, updates, depth):
+        """Return a copy of node with the sorted updates (all sharing depth chars) applied."""
+        if node is None:
+            node = FrozenNode()
+        new = FrozenNode(dict(node.children), freq=node.freq)
+        changed = {word for word, _ in updates}
+        candidates = {word: neg_freq for neg_freq, word in node.top if word not in changed}
+
+        start = 0
+        if len(updates[0][0]) == depth:
+            new.freq += updates[0][1]
+            candidates[updates[0][0]] = -new.freq
+            start = 1
+        while start < len(updates):
+            char = updates[start][0][depth]
+            end = start + 1
+            while end < len(updates) and updates[end][0][depth] == char:
+                end += 1
+            child = self._apply(node.children.get(char), updates[start:end], depth + 1)
+            new.children[char] = child
+            for neg_freq, word in child.top:
+                candidates[word] = neg_freq
+            start = end
+
+        new.top = tuple(heapq.nsmallest(self.k, ((neg_freq, word) for word, neg_freq in candidates.items())))
+        return new
+
+    def items(self):
+        """Yield every published (word, freq) pair; queued updates are not included."""
+        todo = [(self._root, "")]
+        while todo:
+            node, word = todo.pop()
+            if node.freq > 0:
+                yield word, node.freq
+            for char, child in node.children.items():
+                todo.append((child, word + char))
+
+    def input_fuzzy(self, prefix, max_dist=1):
+        """Return top k most frequent words whose prefix is within max_dist edits of prefix."""
+        return _trie_fuzzy(self._root, prefix, max_dist, self.k, lambda node: node.top)
+
+    def input(self, prefix):
+        """Return top k most frequent words with given prefix"""
+        if not prefix:
+            return []
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [word for _, word in node.top]
+
+
+BACKENDS = {
+    "trie": AutocompleteSystem,
+    "radix": RadixAutocompleteSystem,
+    "concurrent": ConcurrentAutocompleteSystem,
+}
+
+
+def create_autocomplete(backend="trie", **kwargs):
+    """Build an autocomplete system by backend name ('trie', 'radix' or 'concurrent')."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {sorted(BACKENDS)}")
+    return BACKENDS[backend](**kwargs)
+
+
+# 🔹 Benchmark helpers
+def load_corpus(path):
+    """Read 'word freq' lines (space or tab separated) into (word, freq) pairs."""
+    corpus = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2:
+                corpus.append((parts[0], int(parts[1])))
+            elif parts:
+                corpus.append((parts[0], 1))
+    return corpus
+
+
+def synthetic_corpus(n, seed=0):
+    """Random lowercase words with Zipf-like frequencies."""
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < n:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(3, 10))))
+    words = sorted(words)
+    rng.shuffle(words)
+    return [(word, 1_000_000 // rank + 1) for rank, word in enumerate(words, 1)]
+
+
+def _percentile(sorted_values, q):
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[index]
+
+
+def benchmark(corpus, queries=2000, k=3, seed=0):
+    """Report build time and p50/p99 input() latency for both modes."""
+    rng = random.Random(seed)
+    prefixes = []
+    for _ in range(queries):
+        word = rng.choice(corpus)[0]
+        prefixes.append(word[:rng.randint(1, min(3, len(word)))])
+
+    for cached in (False, True):
+        auto = AutocompleteSystem(k=k, cached=cached, verbose=False)
+        start = time.perf_counter()
+        for word, freq in corpus:
+            auto.add_word(word, freq)
+        build = time.perf_counter() - start
+
+        latencies = []
+        for prefix in prefixes:
+            start = time.perf_counter()
+            auto.input(prefix)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        mode = "cached top-k" if cached else "heap per query"
+        print(f"{mode:>15}: build {build:.2f}s, "
+              f"p50 {_percentile(latencies, 0.50) * 1e6:.1f}us, "
+              f"p99 {_percentile(latencies, 0.99) * 1e6:.1f}us")
+
+
+def memory_report(corpus, k=3):
+    """Report traced bytes per word for every backend on the same corpus."""
+    configs = [
+        ("trie (freq_map)", lambda: AutocompleteSystem(k=k, verbose=False)),
+        ("trie (cached)", lambda: AutocompleteSystem(k=k, cached=True, verbose=False)),
+        ("radix", lambda: RadixAutocompleteSystem(k=k, verbose=False)),
+    ]
+    for name, factory in configs:
+        tracemalloc.start()
+        auto = factory()
+        for word, freq in corpus:
+            auto.add_word(word, freq)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del auto
+        print(f"{name:>15}: {size / 2**20:.1f} MiB, {size / len(corpus):.0f} bytes/word")
+
+
+def startup_benchmark(corpus, k=3, path=None):
+    """Compare warm-up paths: add_word loop, bulk_load, and opening a snapshot."""
+    import os
+    import tempfile
+
+    def timed(label, fn):
+        start = time.perf_counter()
+        result = fn()
+        print(f"{label:>28}: {(time.perf_counter() - start) * 1e3:9.1f} ms")
+        return result
+
+    def add_words(auto):
+        for word, freq in corpus:
+            auto.add_word(word, freq)
+        return auto
+
+    def bulk(auto):
+        auto.bulk_load(corpus)
+        return auto
+
+    timed("add_word loop (trie)", lambda: add_words(AutocompleteSystem(k=k, cached=True, verbose=False)))
+    timed("add_word loop (radix)", lambda: add_words(RadixAutocompleteSystem(k=k, verbose=False)))
+    timed("bulk_load (trie)", lambda: bulk(AutocompleteSystem(k=k, cached=True, verbose=False)))
+    radix = timed("bulk_load (radix)", lambda: bulk(RadixAutocompleteSystem(k=k, verbose=False)))
+
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".acsnap")
+        os.close(fd)
+    timed("save_snapshot", lambda: save_snapshot(radix, path))
+    print(f"{'snapshot size':>28}: {os.path.getsize(path) / 2**20:9.1f} MiB")
+    snapshot = timed("load_snapshot + first query",
+                     lambda: (lambda snap: (snap.input(corpus[0][0][:1]), snap)[1])(load_snapshot(path)))
+    snapshot.close()
+
+
+def fuzzy_benchmark(corpus, max_dist=1, queries=500, k=3, seed=0):
+    """Report p50/p99 input_fuzzy() latency on prefixes with one random typo."""
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    prefixes = []
+    for _ in range(queries):
+        word = rng.choice(corpus)[0]
+        prefix = list(word[:rng.randint(3, 6)])
+        pos = rng.randrange(len(prefix))
+        edit = rng.choice(("substitute", "insert", "delete"))
+        if edit == "substitute":
+            prefix[pos] = rng.choice(letters)
+        elif edit == "insert":
+            prefix.insert(pos, rng.choice(letters))
+        elif len(prefix) > 1:
+            del prefix[pos]
+        prefixes.append("".join(prefix))
+
+    for name, factory in (("trie (freq_map)", lambda: AutocompleteSystem(k=k, verbose=False)),
+                          ("trie (cached)", lambda: AutocompleteSystem(k=k, cached=True, verbose=False)),
+                          ("radix", lambda: RadixAutocompleteSystem(k=k, verbose=False))):
+        auto = factory()
+        auto.bulk_load(corpus)
+        # freq_map mode ranks subtrees on first use, so the first pass is reported separately
+        for run in ("first pass", "second pass"):
+            latencies = []
+            for prefix in prefixes:
+                start = time.perf_counter()
+                auto.input_fuzzy(prefix, max_dist)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            print(f"{name:>15}: d={max_dist}, {run:<11} "
+                  f"p50 {_percentile(latencies, 0.50) * 1e3:.2f}ms, "
+                  f"p99 {_percentile(latencies, 0.99) * 1e3:.2f}ms")
+        del auto
+
+
+class _LockedAutocomplete:
+    """Baseline for concurrency_benchmark: one global lock around a cached trie."""
+
+    def __init__(self, k):
+        self.inner = AutocompleteSystem(k=k, cached=True, verbose=False)
+        self.lock = threading.Lock()
+
+    def bulk_load(self, items):
+        with self.lock:
+            self.inner.bulk_load(items)
+
+    def add_word(self, word, freq=1):
+        with self.lock:
+            self.inner.add_word(word, freq)
+
+    def flush(self):
+        pass
+
+    def input(self, prefix):
+        with self.lock:
+            return self.inner.input(prefix)
+
+
+def concurrency_benchmark(corpus, readers=4, duration=2.0, batch_size=1000, k=3, seed=0):
+    """Run reader threads against one streaming writer and report operations per second."""
+    rng = random.Random(seed)
+    prefixes = [word[:rng.randint(1, min(3, len(word)))] for word, _ in rng.sample(corpus, min(5000, len(corpus)))]
+    updates = [word for word, _ in rng.sample(corpus, min(50_000, len(corpus)))]
+
+    for name, auto in (("global lock", _LockedAutocomplete(k)),
+                       ("snapshots", ConcurrentAutocompleteSystem(k=k, batch_size=batch_size))):
+        auto.bulk_load(corpus)
+        stop = threading.Event()
+        reads = [0] * readers
+        writes = [0]
+
+        def read(slot):
+            i = slot
+            while not stop.is_set():
+                auto.input(prefixes[i % len(prefixes)])
+                i += 1
+                reads[slot] += 1
+
+        def write():
+            i = 0
+            while not stop.is_set():
+                auto.add_word(updates[i % len(updates)])
+                i += 1
+                writes[0] += 1
+            auto.flush()
+
+        threads = [threading.Thread(target=read, args=(slot,)) for slot in range(readers)]
+        threads.append(threading.Thread(target=write))
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        print(f"{name:>12}: {sum(reads) / duration:10.0f} reads/s, {writes[0] / duration:9.0f} writes/s "
+              f"({readers} readers, 1 writer)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Trie based autocomplete")
+    parser.add_argument("--bench", action="store_true", help="run the latency benchmark")
+    parser.add_argument("--memory", action="store_true", help="report bytes per word for each backend")
+    parser.add_argument("--startup", action="store_true", help="compare startup paths incl. snapshots")
+    parser.add_argument("--fuzzy", action="store_true", help="run the typo-tolerant search benchmark")
+    parser.add_argument("--distance", type=int, default=1, help="edit budget for --fuzzy")
+    parser.add_argument("--threads", type=int, default=0, metavar="N",
+                        help="run the mixed read/write benchmark with N reader threads")
+    parser.add_argument("--snapshot", help="where --startup writes its snapshot file")
+    parser.add_argument("--corpus", help="'word freq' file to load instead of a synthetic corpus")
+    parser.add_argument("--words", type=int, default=200_000, help="synthetic corpus size")
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
 
-# 🔹 Example Usage
-auto = AutocompleteSystem()
-auto.add_word("dog", 5)
-auto.add_word("dove", 3)
-auto.add_word("door", 7)
-auto.add_word("dodge", 2)
-auto.add_word("cat", 6)
+    if args.bench or args.memory or args.startup or args.fuzzy or args.threads:
+        corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.words)
+        print(f"Loaded {len(corpus)} words")
+        if args.bench:
+            benchmark(corpus, k=args.k)
+        if args.memory:
+            memory_report(corpus, k=args.k)
+        if args.startup:
+            startup_benchmark(corpus, k=args.k, path=args.snapshot)
+        if args.fuzzy:
+            fuzzy_benchmark(corpus, max_dist=args.distance, k=args.k)
+        if args.threads:
+            concurrency_benchmark(corpus, readers=args.threads, k=args.k)
+    else:
+        # 🔹 Example Usage
+        auto = AutocompleteSystem()
+        auto.add_word("dog", 5)
+        auto.add_word("dove", 3)
+        auto.add_word("door", 7)
+        auto.add_word("dodge", 2)
+        auto.add_word("cat", 6)
 
-print("\nTop suggestions for 'do':", auto.input("do"))
-print("Top suggestions for 'd':", auto.input("d"))
-print("Top suggestions for 'c':", auto.input("c"))
-print("Top suggestions for 'z':", auto.input("z"))
+        print("\nTop suggestions for 'do':", auto.input("do"))
+        print("Top suggestions for 'd':", auto.input("d"))
+        print("Top suggestions for 'c':", auto.input("c"))
+        print("Top suggestions for 'z':", auto.input("z"))
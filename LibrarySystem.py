@@ -1,5 +1,16 @@
+import gc
 import heapq
+import multiprocessing
+import os
+import random
+import shutil
+import struct
+import tempfile
+import time
+from array import array
 from collections import defaultdict
+from contextlib import contextmanager
+from itertools import accumulate
 
 class LibrarySystem:
     def __init__(self, entries):
@@ -80,19 +91,660 @@ class LibrarySystem:
         return result
 
 
-# Example usage:
-entries = [
-    [1, 101, 5],   # branch 1 has book 101 at price 5
-    [2, 101, 4],   # branch 2 has book 101 at price 4
-    [3, 102, 7],
-    [1, 103, 6],
-    [2, 104, 2]
-]
+@contextmanager
+def _gc_paused():
+    """Skip cyclic GC passes while allocating millions of acyclic tuples."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
-ls = LibrarySystem(entries)
 
-print("Search book 101:", ls.search(101))  # expect [2, 1]
-ls.rent(2, 101)
-print("Report after renting:", ls.report())  # expect [[2, 101]]
-ls.drop(2, 101)
-print("Report after drop:", ls.report())  # expect []
+class IndexedHeap:
+    """Binary min-heap of unique, hashable entries with an entry -> index map, so any entry can be removed."""
+
+    def __init__(self, entries=()):
+        self.heap = list(entries)                                 # entries in heap order
+        heapq.heapify(self.heap)
+        self.index = dict(zip(self.heap, range(len(self.heap))))  # entry -> position in heap
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, entry):
+        return entry in self.index
+
+    def push(self, entry):
+        self.heap.append(entry)
+        self.index[entry] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+
+    def remove(self, entry):
+        """Delete entry in O(log n); raises KeyError if it is not in the heap."""
+        i = self.index.pop(entry)
+        last = self.heap.pop()
+        if i < len(self.heap):
+            self.heap[i] = last
+            self.index[last] = i
+            self._sift_up(i)
+            self._sift_down(self.index[last])
+
+    def smallest(self, k):
+        """The k smallest entries in order, without modifying the heap."""
+        if k >= 8:
+            return heapq.nsmallest(k, self.heap)
+        # the k-th smallest entry of a binary heap sits no deeper than level k - 1
+        return sorted(self.heap[:(1 << k) - 1])[:k]
+
+    def _sift_up(self, i):
+        heap, index = self.heap, self.index
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if heap[parent] <= entry:
+                break
+            heap[i] = heap[parent]
+            index[heap[i]] = i
+            i = parent
+        heap[i] = entry
+        index[entry] = i
+
+    def _sift_down(self, i):
+        heap, index = self.heap, self.index
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and heap[child + 1] < heap[child]:
+                child += 1
+            if entry <= heap[child]:
+                break
+            heap[i] = heap[child]
+            index[heap[i]] = i
+            i = child
+        heap[i] = entry
+        index[entry] = i
+
+
+class IndexedLibrarySystem:
+    def __init__(self, entries):
+        """
+        entries: List of [branchId, bookId, price]
+
+        Same interface as LibrarySystem, but rent/drop really delete from the
+        heaps (O(log n)) instead of leaving tombstones behind.
+        """
+        self.rented_books = IndexedHeap()                 # heap of (price, branchId, bookId)
+        self.price_map = {}                               # (branchId, bookId) -> price
+
+        copies = defaultdict(list)
+        with _gc_paused():
+            for branch, book, price in entries:
+                self.price_map[(branch, book)] = price
+                copies[book].append((price, branch))
+            # bookId -> heap of (price, branchId), heapified once per book
+            self.available_books = defaultdict(IndexedHeap, ((book, IndexedHeap(heap)) for book, heap in copies.items()))
+
+    def search(self, bookId):
+        """Return up to 5 cheapest branches where this book is available."""
+        heap = self.available_books.get(bookId)
+        return [branch for _, branch in heap.smallest(5)] if heap else []
+
+    def rent(self, branch, book):
+        """Rent a book: move from available -> rented."""
+        price = self.price_map[(branch, book)]
+        available = self.available_books.get(book)
+        if available is None or (price, branch) not in available:
+            raise KeyError((branch, book))  # this copy is already rented
+        available.remove((price, branch))
+        if not available:
+            del self.available_books[book]
+        self.rented_books.push((price, branch, book))
+
+    def drop(self, branch, book):
+        """Return a book: move from rented -> available."""
+        price = self.price_map[(branch, book)]
+        self.rented_books.remove((price, branch, book))
+        self.available_books[book].push((price, branch))
+
+    def report(self):
+        """Return up to 5 cheapest rented books as [branch, book]."""
+        return [[branch, book] for _, branch, book in self.rented_books.smallest(5)]
+
+
+SNAPSHOT_MAGIC = b"LIBSNAP1"
+SNAPSHOT_HEADER = struct.Struct("<8sqqqq")  # magic, WAL generation, available copies, rented copies, books
+WAL_RECORD = struct.Struct("<Bqq")          # operation, branchId, bookId
+WAL_RENT, WAL_DROP = 1, 2
+
+
+class DurableLibrarySystem(IndexedLibrarySystem):
+    def __init__(self, directory, entries=None, checkpoint_every=1000000, sync=True, stats=None):
+        """
+        directory: where the snapshot and write-ahead log live
+        entries: List of [branchId, bookId, price], only used if directory holds no snapshot yet
+
+        An IndexedLibrarySystem whose rent/drop operations are appended to a
+        binary write-ahead log. Every checkpoint_every operations the whole
+        state is written to a compact snapshot and a fresh log is started, so
+        a restart loads the snapshot and replays only the log tail. With
+        sync=True every operation is fsync'ed before it returns; rent_many and
+        drop_many share a single fsync. branchId and bookId must be integers.
+        stats (a dict) receives the time spent loading and replaying.
+        """
+        self.directory = directory
+        self.checkpoint_every = checkpoint_every
+        self.sync = sync
+        os.makedirs(directory, exist_ok=True)
+
+        self.wal = None
+        start = time.perf_counter()
+        with _gc_paused():
+            if os.path.exists(self._snapshot_path()):
+                self.generation = self._load_snapshot()
+            elif entries is None:
+                raise FileNotFoundError(f"no snapshot in {directory} and no entries given")
+            else:
+                super().__init__(entries)
+                self.generation = -1
+                self.checkpoint()
+            loaded = time.perf_counter()
+            replayed = self._replay()
+        if stats is not None:
+            stats['snapshot_seconds'] = loaded - start
+            stats['replay_seconds'] = time.perf_counter() - loaded
+            stats['replayed'] = replayed
+        if self.wal is None:
+            self.wal = open(self._wal_path(self.generation), 'ab')
+        self.pending = replayed  # operations since the last snapshot
+
+    def _snapshot_path(self):
+        return os.path.join(self.directory, "snapshot.bin")
+
+    def _wal_path(self, generation):
+        return os.path.join(self.directory, f"wal-{generation}.log")
+
+    def _load_snapshot(self):
+        """Rebuild state from the snapshot; returns its WAL generation."""
+        with open(self._snapshot_path(), 'rb') as f:
+            magic, generation, available, rented, books = SNAPSHOT_HEADER.unpack(f.read(SNAPSHOT_HEADER.size))
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{self._snapshot_path()} is not a LibrarySystem snapshot")
+            columns = []
+            for count in (available, available, available, rented, rented, rented, books, books):
+                column = array('q')
+                column.fromfile(f, count)
+                columns.append(column)
+        branches, prices, book_column, rented_prices, rented_branches, rented_books, books, runs = columns
+
+        # copies are stored sorted (available ones by book, then price and
+        # branch), so each heap is a contiguous run and heapify has nothing to move
+        self.available_books = defaultdict(IndexedHeap)
+        start = 0
+        for book, end in zip(books, accumulate(runs)):
+            self.available_books[book] = IndexedHeap(zip(prices[start:end], branches[start:end]))
+            start = end
+        self.rented_books = IndexedHeap(zip(rented_prices, rented_branches, rented_books))
+
+        self.price_map = dict(zip(zip(branches, book_column), prices))
+        self.price_map.update(zip(zip(rented_branches, rented_books), rented_prices))
+        return generation
+
+    def _replay(self):
+        """Apply the log of the current generation; returns the number of records read."""
+        path = self._wal_path(self.generation)
+        if not os.path.exists(path):
+            return 0
+        with open(path, 'rb') as f:
+            data = f.read()
+        complete = len(data) - len(data) % WAL_RECORD.size
+        if complete != len(data):
+            # a torn record from a crash mid-write was never acknowledged; drop it
+            with open(path, 'r+b') as f:
+                f.truncate(complete)
+        # Only successful operations are logged, so a copy's final state is
+        # simply its last record; apply that once instead of every flip.
+        final = {(branch, book): operation
+                 for operation, branch, book in WAL_RECORD.iter_unpack(memoryview(data)[:complete])}
+        rented = self.rented_books
+        to_rent, to_drop = [], []
+        for (branch, book), operation in final.items():
+            entry = (self.price_map[(branch, book)], branch, book)
+            if operation == WAL_RENT and entry not in rented:
+                to_rent.append(entry)
+            elif operation == WAL_DROP and entry in rented:
+                to_drop.append(entry)
+        self._apply_net(to_rent, to_drop)
+        return complete // WAL_RECORD.size
+
+    def _apply_net(self, to_rent, to_drop):
+        """Move (price, branch, book) entries between available and rented."""
+        if len(to_rent) + len(to_drop) < len(self.rented_books) // 8 + 1000:
+            for _, branch, book in to_rent:
+                IndexedLibrarySystem.rent(self, branch, book)
+            for _, branch, book in to_drop:
+                IndexedLibrarySystem.drop(self, branch, book)
+            return
+
+        # a long tail: rebuild the affected heaps once instead of sifting per entry
+        dropped = set(to_drop)
+        self.rented_books = IndexedHeap([entry for entry in self.rented_books.heap if entry not in dropped] + to_rent)
+        leaving, arriving = defaultdict(set), defaultdict(list)
+        for price, branch, book in to_rent:
+            leaving[book].add((price, branch))
+        for price, branch, book in to_drop:
+            arriving[book].append((price, branch))
+        for book in leaving.keys() | arriving.keys():
+            gone = leaving.get(book, ())
+            copies = [entry for entry in self.available_books[book].heap if entry not in gone]
+            copies += arriving.get(book, [])
+            if copies:
+                self.available_books[book] = IndexedHeap(copies)
+            else:
+                del self.available_books[book]
+
+    def _log(self, records):
+        self.wal.write(b"".join(records))
+        self.wal.flush()
+        if self.sync:
+            os.fsync(self.wal.fileno())
+        self.pending += len(records)
+        if self.pending >= self.checkpoint_every:
+            self.checkpoint()
+
+    def _apply_many(self, operation, pairs):
+        apply = IndexedLibrarySystem.rent if operation == WAL_RENT else IndexedLibrarySystem.drop
+        records = []
+        try:
+            for branch, book in pairs:
+                apply(self, branch, book)
+                records.append(WAL_RECORD.pack(operation, branch, book))
+        finally:
+            # log whatever was applied, even if a later pair was invalid
+            if records:
+                self._log(records)
+
+    def rent(self, branch, book):
+        """Rent a book: move from available -> rented."""
+        self._apply_many(WAL_RENT, [(branch, book)])
+
+    def drop(self, branch, book):
+        """Return a book: move from rented -> available."""
+        self._apply_many(WAL_DROP, [(branch, book)])
+
+    def rent_many(self, pairs):
+        """Rent a batch of (branch, book) pairs with a single log write and fsync."""
+        self._apply_many(WAL_RENT, pairs)
+
+    def drop_many(self, pairs):
+        """Return a batch of (branch, book) pairs with a single log write and fsync."""
+        self._apply_many(WAL_DROP, pairs)
+
+    def checkpoint(self):
+        """Write a snapshot of the current state and start a new, empty log."""
+        branches, prices, book_column = array('q'), array('q'), array('q')
+        books, runs = array('q'), array('q')
+        with _gc_paused():
+            for book in sorted(self.available_books):
+                copies = sorted(self.available_books[book].heap)
+                if not copies:
+                    continue
+                prices.extend(price for price, _ in copies)
+                branches.extend(branch for _, branch in copies)
+                book_column.extend([book] * len(copies))
+                books.append(book)
+                runs.append(len(copies))
+            rented = sorted(self.rented_books.heap)
+
+        generation = self.generation + 1
+        path = self._snapshot_path()
+        with open(path + ".tmp", 'wb') as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, generation, len(branches), len(rented), len(books)))
+            for column in (branches, prices, book_column):
+                column.tofile(f)
+            for i in range(3):  # prices, branches, books
+                array('q', (entry[i] for entry in rented)).tofile(f)
+            books.tofile(f)
+            runs.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        # the snapshot only takes effect once renamed; until then the old
+        # snapshot and its log are still a consistent pair
+        os.replace(path + ".tmp", path)
+        directory = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+        if self.wal is not None:
+            self.wal.close()
+        old = self._wal_path(self.generation)
+        self.generation = generation
+        self.wal = open(self._wal_path(generation), 'ab')
+        self.pending = 0
+        if os.path.exists(old):
+            os.remove(old)
+
+    def close(self):
+        self.wal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _shard_worker(connection, entries):
+    """Serve one shard's IndexedLibrarySystem over a pipe until told to close."""
+    system = IndexedLibrarySystem(entries)
+
+    def rent_many(pairs):
+        for branch, book in pairs:
+            system.rent(branch, book)
+
+    def drop_many(pairs):
+        for branch, book in pairs:
+            system.drop(branch, book)
+
+    handlers = {
+        "search": system.search,
+        "rent_many": rent_many,
+        "drop_many": drop_many,
+        "report": lambda _: system.rented_books.smallest(5),
+    }
+    while True:
+        command, argument = connection.recv()
+        if command == "close":
+            break
+        try:
+            connection.send((True, handlers[command](argument)))
+        except Exception as error:
+            connection.send((False, error))
+    connection.close()
+
+
+class ShardedLibrarySystem:
+    def __init__(self, entries, shards=4):
+        """
+        entries: List of [branchId, bookId, price]
+
+        Same interface as LibrarySystem, with books partitioned by bookId across
+        `shards` worker processes. Each worker owns the available and rented
+        copies of its books; report() merges the per-shard top 5.
+        """
+        self.shards = shards
+        partitions = [[] for _ in range(shards)]
+        for entry in entries:
+            partitions[hash(entry[1]) % shards].append(entry)
+
+        self.connections = []
+        self.workers = []
+        for partition in partitions:
+            parent, child = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_shard_worker, args=(child, partition), daemon=True)
+            worker.start()
+            child.close()
+            self.connections.append(parent)
+            self.workers.append(worker)
+
+    def _shard(self, book):
+        return hash(book) % self.shards
+
+    def _call(self, requests):
+        """Send {shard: (command, argument)} to every shard first, then collect the replies."""
+        for shard, request in requests.items():
+            self.connections[shard].send(request)
+        results, error = {}, None
+        for shard in requests:
+            ok, result = self.connections[shard].recv()
+            if ok:
+                results[shard] = result
+            elif error is None:
+                error = result
+        if error is not None:
+            raise error
+        return results
+
+    def _batched(self, command, pairs):
+        batches = defaultdict(list)
+        for branch, book in pairs:
+            batches[self._shard(book)].append((branch, book))
+        self._call({shard: (command, batch) for shard, batch in batches.items()})
+
+    def search(self, bookId):
+        """Return up to 5 cheapest branches where this book is available."""
+        shard = self._shard(bookId)
+        return self._call({shard: ("search", bookId)})[shard]
+
+    def rent(self, branch, book):
+        """Rent a book: move from available -> rented."""
+        self.rent_many([(branch, book)])
+
+    def drop(self, branch, book):
+        """Return a book: move from rented -> available."""
+        self.drop_many([(branch, book)])
+
+    def rent_many(self, pairs):
+        """Rent a batch of (branch, book) pairs with one round trip per shard."""
+        self._batched("rent_many", pairs)
+
+    def drop_many(self, pairs):
+        """Return a batch of (branch, book) pairs with one round trip per shard."""
+        self._batched("drop_many", pairs)
+
+    def report(self):
+        """Return up to 5 cheapest rented books as [branch, book]."""
+        tops = self._call({shard: ("report", None) for shard in range(self.shards)})
+        merged = heapq.merge(*tops.values())
+        return [[branch, book] for _, branch, book in list(merged)[:5]]
+
+    def close(self):
+        for connection in self.connections:
+            connection.send(("close", None))
+            connection.close()
+        for worker in self.workers:
+            worker.join()
+        self.connections, self.workers = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def churn_benchmark(branches=1000, books=2000, copies=100000, operations=1000000, window=200000, seed=0):
+    """
+    Rent/drop/search/report churn against both backends.
+
+    Prints per-operation latency and retained memory for each window of
+    operations, so tombstone growth in the lazy backend shows up over time.
+    """
+    rng = random.Random(seed)
+    pairs = rng.sample(range(branches * books), copies)
+    entries = [[pair // books, pair % books, rng.randint(1, 100)] for pair in pairs]
+
+    for backend in (LibrarySystem, IndexedLibrarySystem):
+        print(backend.__name__)
+        system = backend(entries)
+        rng = random.Random(seed + 1)
+        available = [(branch, book) for branch, book, _ in entries]
+        rented = []
+        done = 0
+        while done < operations:
+            start = time.perf_counter()
+            for _ in range(window):
+                choice = rng.random()
+                if choice < 0.3 and available:
+                    i = rng.randrange(len(available))
+                    available[i], available[-1] = available[-1], available[i]
+                    pair = available.pop()
+                    system.rent(*pair)
+                    rented.append(pair)
+                elif choice < 0.6 and rented:
+                    i = rng.randrange(len(rented))
+                    rented[i], rented[-1] = rented[-1], rented[i]
+                    pair = rented.pop()
+                    system.drop(*pair)
+                    available.append(pair)
+                elif choice < 0.9:
+                    system.search(rng.randrange(books))
+                else:
+                    system.report()
+            elapsed = time.perf_counter() - start
+            done += window
+            # everything the backend is holding on to, tombstones included
+            held = sum(len(heap) for heap in system.available_books.values()) + len(system.rented_books)
+            held += len(getattr(system, 'invalid_available', ())) + len(getattr(system, 'invalid_rented', ()))
+            print(f"  ops {done:>9}: {elapsed / window * 1e6:6.2f} us/op, "
+                  f"{held:>9} heap entries + tombstones ({copies} copies)")
+
+
+def shard_benchmark(branches=5000, books=100000, copies=1000000, batch=10000, rounds=20,
+                    shard_counts=(1, 2, 4, 8), seed=0):
+    """
+    Throughput of bursts of rent_many/drop_many across shard counts.
+
+    Each round rents `batch` random available copies in one call, drops them
+    again in one call and asks for report(). The in-process IndexedLibrarySystem
+    doing the same work one call at a time is the baseline.
+    """
+    rng = random.Random(seed)
+    pairs = rng.sample(range(branches * books), copies)
+    entries = [[pair // books, pair % books, rng.randint(1, 100)] for pair in pairs]
+    bursts = [[(branch, book) for branch, book, _ in rng.sample(entries, batch)] for _ in range(rounds)]
+    operations = rounds * 2 * batch
+    print(f"{copies} copies of {books} books in {branches} branches; "
+          f"{rounds} bursts of {batch} rents + {batch} drops")
+
+    start = time.perf_counter()
+    system = IndexedLibrarySystem(entries)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    for burst in bursts:
+        for branch, book in burst:
+            system.rent(branch, book)
+        for branch, book in burst:
+            system.drop(branch, book)
+        system.report()
+    baseline = time.perf_counter() - start
+    print(f"  in-process: start {built:5.2f}s, {operations / baseline:>10,.0f} ops/s")
+
+    for shards in shard_counts:
+        start = time.perf_counter()
+        with ShardedLibrarySystem(entries, shards) as sharded:
+            sharded.report()  # wait until every worker has built its shard
+            built = time.perf_counter() - start
+            start = time.perf_counter()
+            for burst in bursts:
+                sharded.rent_many(burst)
+                sharded.drop_many(burst)
+                sharded.report()
+            elapsed = time.perf_counter() - start
+        print(f"  {shards} shard{'s' if shards > 1 else ' '}:   start {built:5.2f}s, "
+              f"{operations / elapsed:>10,.0f} ops/s ({baseline / elapsed:.2f}x)")
+
+
+def recovery_benchmark(copies=10000000, tail=1000000, branches=20000, books=500000, seed=0):
+    """
+    Restart time at `copies` entries: rebuilding from the entries list versus
+    loading a snapshot and replaying a WAL tail of `tail` rent/drop operations.
+    """
+    rng = random.Random(seed)
+    pairs = rng.sample(range(branches * books), copies)
+    entries = [[pair // books, pair % books, rng.randint(1, 100)] for pair in pairs]
+    del pairs
+    print(f"{copies} copies, WAL tail of {tail} operations")
+
+    start = time.perf_counter()
+    system = IndexedLibrarySystem(entries)
+    print(f"  rebuild from entries:        {time.perf_counter() - start:6.2f}s")
+    del system
+    gc.collect()
+
+    directory = tempfile.mkdtemp(prefix="library-")
+    try:
+        start = time.perf_counter()
+        system = DurableLibrarySystem(directory, entries, checkpoint_every=tail + 1, sync=False)
+        print(f"  first start + snapshot:      {time.perf_counter() - start:6.2f}s")
+        # rent 2/3 of the tail's copies, then return half of those again
+        renting = [(branch, book) for branch, book, _ in rng.sample(entries, min(copies, 2 * tail // 3))]
+        dropping = renting[:tail - len(renting)]
+        del entries
+        gc.collect()
+
+        start = time.perf_counter()
+        for pairs, log in ((renting, system.rent_many), (dropping, system.drop_many)):
+            for i in range(0, len(pairs), 10000):
+                log(pairs[i:i + 10000])
+        elapsed = time.perf_counter() - start
+        logged = len(renting) + len(dropping)
+        print(f"  logging {logged} operations: {elapsed:6.2f}s ({logged / elapsed:,.0f} ops/s, no fsync)")
+        snapshot = os.path.getsize(system._snapshot_path())
+        wal = os.path.getsize(system._wal_path(system.generation))
+        system.close()
+        del system
+        gc.collect()
+
+        stats = {}
+        start = time.perf_counter()
+        system = DurableLibrarySystem(directory, stats=stats)
+        print(f"  recover snapshot + WAL tail: {time.perf_counter() - start:6.2f}s "
+              f"(snapshot {stats['snapshot_seconds']:.2f}s, replay of {stats['replayed']} "
+              f"records {stats['replay_seconds']:.2f}s; files {snapshot / 2**20:.0f} MiB + {wal / 2**20:.0f} MiB)")
+
+        start = time.perf_counter()
+        system.checkpoint()
+        print(f"  checkpoint:                  {time.perf_counter() - start:6.2f}s")
+        system.close()
+        del system
+        gc.collect()
+
+        start = time.perf_counter()
+        system = DurableLibrarySystem(directory)
+        print(f"  recover snapshot only:       {time.perf_counter() - start:6.2f}s")
+        system.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="LibrarySystem example and churn benchmark")
+    parser.add_argument("--churn", action="store_true", help="run the rent/drop churn benchmark")
+    parser.add_argument("--operations", type=int, default=1000000)
+    parser.add_argument("--shards", type=int, nargs="*", help="run the sharded throughput benchmark")
+    parser.add_argument("--recovery", action="store_true", help="run the WAL/snapshot recovery benchmark")
+    parser.add_argument("--copies", type=int, default=10000000)
+    args = parser.parse_args()
+    if args.churn:
+        churn_benchmark(operations=args.operations)
+    elif args.recovery:
+        recovery_benchmark(copies=args.copies)
+    elif args.shards is not None:
+        shard_benchmark(shard_counts=args.shards or (1, 2, 4, 8))
+    else:
+        # Example usage:
+        entries = [
+            [1, 101, 5],   # branch 1 has book 101 at price 5
+            [2, 101, 4],   # branch 2 has book 101 at price 4
+            [3, 102, 7],
+            [1, 103, 6],
+            [2, 104, 2]
+        ]
+
+        ls = LibrarySystem(entries)
+
+        print("Search book 101:", ls.search(101))  # expect [2, 1]
+        ls.rent(2, 101)
+        print("Report after renting:", ls.report())  # expect [[2, 101]]
+        ls.drop(2, 101)
+        print("Report after drop:", ls.report())  # expect []
@@ -99,6 +99,63 @@ def getMinUnshippedParcels_optimized(weights, max_wt):
     return len(weights) - shipped
 
 
+def getMinUnshippedParcels_counting(weights, max_wt):
+    """
+    Counting-based version that never sorts the weights.
+    
+    Only a narrow band of weights can ever be refused. At most n - 1 trips
+    happen before any given parcel is considered, so the capacity never drops
+    below max_wt - n + 1 and every parcel lighter than max_wt - n always
+    ships. The greedy therefore only needs the parcels in the band
+    (max_wt - n - 1, max_wt), which are counted into one bucket per weight
+    (at most n + 1 buckets, however large max_wt is). Walking the buckets
+    from heavy to light replays the descending greedy, and a whole bucket of
+    equal weights is shipped in one step.
+    
+    Parameters:
+    -----------
+    weights : list[int]
+        The weights of the parcels
+    max_wt : int
+        The maximum weight the truck can carry initially
+    
+    Returns:
+    --------
+    int : The minimum number of parcels that cannot be shipped
+    
+    Time Complexity: O(n)
+    Space Complexity: O(min(n, max_wt)) for the buckets
+    """
+    if not weights:
+        return 0
+    
+    if max_wt <= 0:
+        return len(weights)
+    
+    n = len(weights)
+    # Parcels of weight <= band_floor always ship; heavier ones are bucketed
+    band_floor = max(max_wt - n - 1, min(weights) - 1)
+    buckets = [0] * max(0, max_wt - 1 - band_floor)
+    always_shipped = 0
+    for weight in weights:
+        if weight < max_wt:
+            if weight > band_floor:
+                buckets[weight - band_floor - 1] += 1
+            else:
+                always_shipped += 1
+    
+    capacity = max_wt
+    weight = max_wt
+    for count in reversed(buckets):
+        weight -= 1
+        if count and capacity > weight:
+            # ship while weight < capacity (and capacity stays positive)
+            capacity -= min(count, capacity - max(weight, 0))
+    
+    shipped = max_wt - capacity + always_shipped
+    return n - shipped
+
+
 # Main function for testing
 if __name__ == "__main__":
     # Test Case 1: Example from problem
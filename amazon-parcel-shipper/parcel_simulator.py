@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Streaming parcel dispatch to several trucks.
+
+Each truck follows the rule from parcel_shipper.py: it can carry a parcel
+whose weight is strictly less than its current capacity, and its capacity
+drops by 1 after every trip. Parcels arrive one at a time (or in batches)
+and each is assigned to a truck as it arrives.
+
+Assignment is best fit: the truck with the smallest capacity that is still
+greater than the weight, so high-capacity trucks stay free for heavy
+parcels. With a single truck and a batch sorted heaviest first, this is
+exactly getMinUnshippedParcels.
+
+Capacities are kept in one sorted list. If the best truck sits at index i,
+every truck before it has capacity <= weight < capacities[i], so after the
+decrement the list is still sorted. Nothing ever moves, and each parcel
+costs one bisect: O(log T) for T trucks.
+"""
+
+import random
+import time
+from bisect import bisect_right
+
+
+class ParcelDispatcher:
+    """
+    Assign a stream of parcels to trucks with decaying capacities.
+
+    Parameters:
+    -----------
+    capacities : list[int]
+        Initial max_wt of each truck; truck ids are indices into this list
+    """
+
+    def __init__(self, capacities):
+        order = sorted(range(len(capacities)), key=capacities.__getitem__)
+        self._capacities = [capacities[truck] for truck in order]  # ascending
+        self._trucks = order          # sorted position -> truck id
+        self._trips = [0] * len(order)  # per sorted position
+        self.shipped = 0
+        self.unshipped = 0
+
+    def dispatch(self, weight):
+        """
+        Ship one parcel on the best-fitting truck.
+
+        Returns:
+        --------
+        int or None : Id of the truck that took the parcel, or None if no
+        truck currently has capacity greater than weight
+        """
+        capacities = self._capacities
+        i = bisect_right(capacities, weight)
+        if i == len(capacities) or capacities[i] <= 0:
+            self.unshipped += 1
+            return None
+        capacities[i] -= 1
+        self._trips[i] += 1
+        self.shipped += 1
+        return self._trucks[i]
+
+    def dispatch_many(self, weights):
+        """
+        Dispatch parcels in arrival order without reporting the trucks.
+
+        Returns:
+        --------
+        int : Number of parcels from weights that could not be shipped
+        """
+        capacities = self._capacities
+        trips = self._trips
+        trucks = len(capacities)
+        shipped = unshipped = 0
+        for weight in weights:
+            i = bisect_right(capacities, weight)
+            if i == trucks or capacities[i] <= 0:
+                unshipped += 1
+            else:
+                capacities[i] -= 1
+                trips[i] += 1
+                shipped += 1
+        self.shipped += shipped
+        self.unshipped += unshipped
+        return unshipped
+
+    def dispatch_batch(self, weights):
+        """
+        Dispatch a batch of parcels heaviest first, as the single-truck greedy does.
+
+        Returns:
+        --------
+        int : Number of parcels from the batch that could not be shipped
+        """
+        return self.dispatch_many(sorted(weights, reverse=True))
+
+    def capacities(self):
+        """Current capacity of every truck, indexed by truck id."""
+        current = [0] * len(self._trucks)
+        for capacity, truck in zip(self._capacities, self._trucks):
+            current[truck] = capacity
+        return current
+
+    def trips(self):
+        """Number of parcels shipped by every truck, indexed by truck id."""
+        counts = [0] * len(self._trucks)
+        for trips, truck in zip(self._trips, self._trucks):
+            counts[truck] = trips
+        return counts
+
+
+def _dispatch_linear_scan(capacities, weights):
+    """Reference O(T)-per-parcel best fit; returns the number of unshipped parcels."""
+    capacities = list(capacities)
+    unshipped = 0
+    for weight in weights:
+        best = None
+        for truck, capacity in enumerate(capacities):
+            if capacity > weight and capacity > 0 and (best is None or capacity < capacities[best]):
+                best = truck
+        if best is None:
+            unshipped += 1
+        else:
+            capacities[best] -= 1
+    return unshipped
+
+
+def throughput_report(parcels=(10**6, 5 * 10**6), trucks=(10, 1000, 100000), seed=0):
+    """Print parcels per second for streams of parcels over fleets of trucks."""
+    rng = random.Random(seed)
+    for count in parcels:
+        weights = [rng.randint(1, 1000) for _ in range(count)]
+        for fleet in trucks:
+            # sized so the fleet runs out of capacity part-way through the stream
+            capacities = [rng.randint(1000, 1000 + count // fleet) for _ in range(fleet)]
+            dispatcher = ParcelDispatcher(capacities)
+            start = time.perf_counter()
+            unshipped = dispatcher.dispatch_many(weights)
+            elapsed = time.perf_counter() - start
+            print(f"{count:>9} parcels, {fleet:>6} trucks: {elapsed:6.2f}s, "
+                  f"{count / elapsed:>12,.0f} parcels/s, {unshipped} unshipped")
+
+    # the per-parcel O(T) scan this replaces, on a slice small enough to finish
+    sample = weights[:20000]
+    for fleet in (10, 1000):
+        capacities = [rng.randint(1000, 1000 + len(sample) // fleet) for _ in range(fleet)]
+        start = time.perf_counter()
+        _dispatch_linear_scan(capacities, sample)
+        elapsed = time.perf_counter() - start
+        print(f"{len(sample):>9} parcels, {fleet:>6} trucks, linear scan: "
+              f"{len(sample) / elapsed:>12,.0f} parcels/s")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Multi-truck parcel dispatch throughput")
+    parser.add_argument("--parcels", type=int, nargs="+", default=[10**6, 5 * 10**6])
+    parser.add_argument("--trucks", type=int, nargs="+", default=[10, 1000, 100000])
+    args = parser.parse_args()
+    throughput_report(args.parcels, args.trucks)
@@ -4,8 +4,11 @@ Comprehensive test suite for the Amazon Parcel Shipper problem.
 Includes edge cases and stress tests.
 """
 
+import random
+import time
 import unittest
-from parcel_shipper import getMinUnshippedParcels, getMinUnshippedParcels_optimized
+from parcel_shipper import (getMinUnshippedParcels, getMinUnshippedParcels_optimized,
+                            getMinUnshippedParcels_counting)
 
 
 class TestParcelShipper(unittest.TestCase):
@@ -159,6 +162,24 @@ class TestParcelShipper(unittest.TestCase):
                            f"Both versions should match for weights={weights}, max_wt={max_wt}")
 
 
+    def test_counting_version_consistency(self):
+        """Test that the counting version matches the sorting greedy on random inputs"""
+        rng = random.Random(18)
+        for _ in range(5000):
+            n = rng.randint(0, 15)
+            weights = [rng.randint(1, rng.choice([3, 10, 40])) for _ in range(n)]
+            max_wt = rng.randint(-2, 50)
+            self.assertEqual(getMinUnshippedParcels_counting(weights, max_wt),
+                             getMinUnshippedParcels(weights, max_wt),
+                             f"weights={weights}, max_wt={max_wt}")
+    
+    def test_counting_version_huge_capacity(self):
+        """Test that max_wt near 10^9 does not allocate per unit of capacity"""
+        weights = [999999999, 1, 2, 10**9]
+        self.assertEqual(getMinUnshippedParcels_counting(weights, 10**9), 1)
+        self.assertEqual(getMinUnshippedParcels_counting([1] * 10, 10**9), 0)
+
+
 class TestPerformance(unittest.TestCase):
     """Performance tests for large inputs"""
     
@@ -180,6 +201,50 @@ class TestPerformance(unittest.TestCase):
         self.assertEqual(result, 1000, "No parcels can ship when weight equals capacity")
 
 
+class TestScaling(unittest.TestCase):
+    """Scaling benchmarks from n = 10^5 to 10^7, sorting greedy vs counting"""
+    
+    SIZES = (10**5, 10**6, 10**7)
+    # the sorting version is only timed up to this size to keep the suite quick
+    SORT_LIMIT = 10**6
+    
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(19)
+        # a shared pool keeps 10^7 parcels at ~80 MB instead of one int object each
+        cls.pool = [rng.randint(1, 10**9) for _ in range(1 << 16)]
+        cls.rng = rng
+    
+    def _compare(self, max_wt_for):
+        print()
+        for n in self.SIZES:
+            weights = self.rng.choices(self.pool, k=n)
+            max_wt = max_wt_for(n)
+            start = time.perf_counter()
+            result = getMinUnshippedParcels_counting(weights, max_wt)
+            counting = time.perf_counter() - start
+            line = f"  n={n:>8}, max_wt={max_wt:>10}: counting {counting:6.2f}s"
+            if n <= self.SORT_LIMIT:
+                start = time.perf_counter()
+                expected = getMinUnshippedParcels(weights, max_wt)
+                sorting = time.perf_counter() - start
+                self.assertEqual(result, expected)
+                line += f", sorting {sorting:6.2f}s ({sorting / counting:.1f}x)"
+            print(line)
+    
+    def test_small_capacity(self):
+        """max_wt much smaller than n: only a few parcels can ever ship"""
+        self._compare(lambda n: 1000)
+    
+    def test_capacity_near_n(self):
+        """max_wt around n"""
+        self._compare(lambda n: n // 2)
+    
+    def test_capacity_at_limit(self):
+        """max_wt = 10^9: the band of contested weights is n wide"""
+        self._compare(lambda n: 10**9)
+
+
 if __name__ == "__main__":
     # Run all tests
     unittest.main(verbosity=2)
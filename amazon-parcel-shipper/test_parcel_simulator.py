@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test suite for the multi-truck streaming parcel dispatcher.
+"""
+
+import random
+import time
+import unittest
+from parcel_shipper import getMinUnshippedParcels
+from parcel_simulator import ParcelDispatcher, _dispatch_linear_scan
+
+
+class TestParcelDispatcher(unittest.TestCase):
+    """Test cases for ParcelDispatcher"""
+    
+    def test_single_truck_matches_greedy(self):
+        """One truck fed heaviest first reproduces getMinUnshippedParcels"""
+        for weights, max_wt in (([7, 1, 7, 4], 6), ([5, 3, 1, 9, 7], 4), ([1, 6, 8], 1)):
+            dispatcher = ParcelDispatcher([max_wt])
+            self.assertEqual(dispatcher.dispatch_batch(weights),
+                             getMinUnshippedParcels(weights, max_wt))
+    
+    def test_single_truck_random(self):
+        """Random batches through one truck agree with the single-truck greedy"""
+        rng = random.Random(20)
+        for _ in range(2000):
+            weights = [rng.randint(1, 30) for _ in range(rng.randint(0, 15))]
+            max_wt = rng.randint(0, 40)
+            self.assertEqual(ParcelDispatcher([max_wt]).dispatch_batch(weights),
+                             getMinUnshippedParcels(weights, max_wt))
+    
+    def test_best_fit_choice(self):
+        """A parcel goes to the smallest capacity that still exceeds its weight"""
+        dispatcher = ParcelDispatcher([10, 4, 7])
+        self.assertEqual(dispatcher.dispatch(5), 2)   # 7 is the best fit
+        self.assertEqual(dispatcher.dispatch(5), 2)   # now 6
+        self.assertEqual(dispatcher.dispatch(5), 0)   # 5 is no longer > 5
+        self.assertEqual(dispatcher.dispatch(3), 1)
+        self.assertIsNone(dispatcher.dispatch(10))
+        self.assertEqual(dispatcher.capacities(), [9, 3, 5])
+        self.assertEqual(dispatcher.trips(), [1, 1, 2])
+        self.assertEqual((dispatcher.shipped, dispatcher.unshipped), (4, 1))
+    
+    def test_matches_linear_scan(self):
+        """Bisect assignment agrees with an O(T) scan on random streams"""
+        rng = random.Random(21)
+        for _ in range(300):
+            capacities = [rng.randint(0, 30) for _ in range(rng.randint(1, 8))]
+            weights = [rng.randint(1, 30) for _ in range(rng.randint(0, 60))]
+            dispatcher = ParcelDispatcher(capacities)
+            self.assertEqual(dispatcher.dispatch_many(weights),
+                             _dispatch_linear_scan(capacities, weights))
+    
+    def test_dispatch_and_dispatch_many_agree(self):
+        """Per-parcel and bulk dispatch leave the fleet in the same state"""
+        rng = random.Random(22)
+        capacities = [rng.randint(1, 100) for _ in range(20)]
+        weights = [rng.randint(1, 100) for _ in range(500)]
+        one, many = ParcelDispatcher(capacities), ParcelDispatcher(capacities)
+        unshipped = sum(one.dispatch(weight) is None for weight in weights)
+        self.assertEqual(many.dispatch_many(weights), unshipped)
+        self.assertEqual(one.capacities(), many.capacities())
+        self.assertEqual(one.trips(), many.trips())
+    
+    def test_no_trucks(self):
+        """Without trucks nothing ships"""
+        dispatcher = ParcelDispatcher([])
+        self.assertIsNone(dispatcher.dispatch(1))
+        self.assertEqual(dispatcher.dispatch_many([1, 2, 3]), 3)
+
+
+class TestThroughput(unittest.TestCase):
+    """Throughput on a stream of a million parcels"""
+    
+    def test_million_parcels(self):
+        """10^6 parcels over 10^4 trucks"""
+        rng = random.Random(23)
+        weights = [rng.randint(1, 1000) for _ in range(10**6)]
+        dispatcher = ParcelDispatcher([rng.randint(1000, 1100) for _ in range(10**4)])
+        start = time.perf_counter()
+        unshipped = dispatcher.dispatch_many(weights)
+        elapsed = time.perf_counter() - start
+        print(f"\n  10^6 parcels, 10^4 trucks: {10**6 / elapsed:,.0f} parcels/s")
+        self.assertEqual(dispatcher.shipped + unshipped, 10**6)
+        self.assertEqual(sum(dispatcher.trips()), dispatcher.shipped)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,271 @@
+"""
+Contraction hierarchies for answering many shortest-path queries on a static graph.
+
+Preprocessing contracts nodes one by one, cheapest first. Contracting v removes
+it from the graph and adds a shortcut u -> w whenever u -> v -> w is the only
+shortest path between u and w (checked with a bounded witness search). Each node
+keeps only its edges to nodes contracted after it, so a query is two small
+Dijkstra searches that only ever move "up" the hierarchy, from the source along
+outgoing edges and from the target along incoming ones.
+
+Graphs use the same dict-of-dicts format as dijkstra.py.
+"""
+
+import heapq
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from dijkstra import grid_graph, shortest_path, bidirectional_dijkstra, reverse_graph
+
+
+class ContractionHierarchy:
+    def __init__(self, rank, up, down, middle):
+        self.rank = rank      # node -> contraction order
+        self.up = up          # u -> {v: w} for edges u -> v with rank[v] > rank[u]
+        self.down = down      # v -> {u: w} for edges u -> v with rank[u] > rank[v]
+        self.middle = middle  # (u, w) -> v for every shortcut u -> v -> w
+
+    @classmethod
+    def build(cls, graph, settle_limit=500, stats=None):
+        """Contract every node of graph; stats (a dict) receives shortcut counts."""
+        out_edges = {node: dict(edges) for node, edges in graph.items()}
+        in_edges = reverse_graph(graph)
+        for node in in_edges:
+            out_edges.setdefault(node, {})
+        rank, up, down, middle = {}, {}, {}, {}
+        deleted_neighbors = dict.fromkeys(out_edges, 0)
+        shortcuts = 0
+
+        def witness_distances(start, skip, limit, targets):
+            """Bounded Dijkstra from start that avoids skip; stops at limit or once targets are settled."""
+            distances = {start: 0}
+            queue = [(0, start)]
+            settled = 0
+            remaining = set(targets)
+            while queue and remaining and settled < settle_limit:
+                distance, node = heapq.heappop(queue)
+                if distance > distances[node]:
+                    continue
+                if distance > limit:
+                    break
+                settled += 1
+                remaining.discard(node)
+                for neighbor, weight in out_edges[node].items():
+                    if neighbor == skip:
+                        continue
+                    candidate = distance + weight
+                    if candidate < distances.get(neighbor, float('inf')):
+                        distances[neighbor] = candidate
+                        heapq.heappush(queue, (candidate, neighbor))
+            return distances
+
+        def needed_shortcuts(node):
+            found = []
+            outgoing = out_edges[node]
+            for source, in_weight in in_edges[node].items():
+                targets = [t for t in outgoing if t != source]
+                if not targets:
+                    continue
+                limit = in_weight + max(outgoing[t] for t in targets)
+                distances = witness_distances(source, node, limit, targets)
+                for target in targets:
+                    via = in_weight + outgoing[target]
+                    if distances.get(target, float('inf')) > via:
+                        found.append((source, target, via))
+            return found
+
+        def priority(node, found):
+            # edge difference plus a term that spreads contraction evenly
+            removed = len(in_edges[node]) + len(out_edges[node])
+            return len(found) - removed + deleted_neighbors[node]
+
+        queue = [(priority(node, needed_shortcuts(node)), node) for node in out_edges]
+        heapq.heapify(queue)
+        order = 0
+        while queue:
+            _, node = heapq.heappop(queue)
+            if node in rank:
+                continue
+            # lazy update: re-evaluate and defer if the node is no longer the cheapest
+            found = needed_shortcuts(node)
+            current = priority(node, found)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, node))
+                continue
+
+            for source, target, via in found:
+                if via < out_edges[source].get(target, float('inf')):
+                    out_edges[source][target] = via
+                    in_edges[target][source] = via
+                    middle[(source, target)] = node
+                    shortcuts += 1
+
+            rank[node] = order
+            order += 1
+            up[node] = out_edges.pop(node)
+            down[node] = in_edges.pop(node)
+            for neighbor in up[node]:
+                del in_edges[neighbor][node]
+                deleted_neighbors[neighbor] += 1
+            for neighbor in down[node]:
+                del out_edges[neighbor][node]
+                deleted_neighbors[neighbor] += 1
+
+        if stats is not None:
+            stats['shortcuts'] = shortcuts
+            stats['edges'] = sum(len(edges) for edges in up.values()) + sum(len(edges) for edges in down.values())
+        return cls(rank, up, down, middle)
+
+    def _search(self, source, target):
+        """Both upward searches; returns (distance, meeting node, forward preds, backward preds, settled)."""
+        inf = float('inf')
+        distances = ({source: 0}, {target: 0})
+        predecessors = ({source: None}, {target: None})
+        queues = ([(0, source)], [(0, target)])
+        graphs = (self.up, self.down)
+        best, meeting = inf, None
+        settled = 0
+        while queues[0] or queues[1]:
+            side = 0 if queues[0] and (not queues[1] or queues[0][0][0] <= queues[1][0][0]) else 1
+            distance, node = heapq.heappop(queues[side])
+            if distance > distances[side][node]:
+                continue
+            if distance >= best:
+                queues[side].clear()  # nothing left on this side can improve the answer
+                continue
+            settled += 1
+            other = distances[1 - side].get(node)
+            if other is not None and distance + other < best:
+                best, meeting = distance + other, node
+            for neighbor, weight in graphs[side].get(node, {}).items():
+                candidate = distance + weight
+                if candidate < distances[side].get(neighbor, inf):
+                    distances[side][neighbor] = candidate
+                    predecessors[side][neighbor] = node
+                    heapq.heappush(queues[side], (candidate, neighbor))
+        return best, meeting, predecessors[0], predecessors[1], settled
+
+    def query(self, source, target):
+        """Shortest distance from source to target (inf if unreachable)."""
+        if source not in self.rank or target not in self.rank:
+            return float('inf')
+        return self._search(source, target)[0]
+
+    def _unpack(self, u, w, path):
+        """Append the original nodes of edge u -> w (without u) to path."""
+        todo = [(u, w)]
+        while todo:
+            a, b = todo.pop()
+            via = self.middle.get((a, b))
+            if via is None:
+                path.append(b)
+            else:
+                todo.append((via, b))
+                todo.append((a, via))
+
+    def shortest_path(self, source, target, stats=None):
+        """Return (distance, path) with shortcuts expanded back into original edges."""
+        if source not in self.rank or target not in self.rank:
+            return float('inf'), []
+        best, meeting, forward, backward, settled = self._search(source, target)
+        if stats is not None:
+            stats['settled'] = settled
+        if meeting is None:
+            return float('inf'), []
+
+        hops = [meeting]
+        while forward[hops[-1]] is not None:
+            hops.append(forward[hops[-1]])
+        hops.reverse()
+        node = meeting
+        while backward[node] is not None:
+            node = backward[node]
+            hops.append(node)
+
+        path = [source]
+        for u, w in zip(hops, hops[1:]):
+            self._unpack(u, w, path)
+        return best, path
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump({
+                "rank": [[node, order] for node, order in self.rank.items()],
+                "up": [[u, v, w] for u, edges in self.up.items() for v, w in edges.items()],
+                "down": [[v, u, w] for v, edges in self.down.items() for u, w in edges.items()],
+                "middle": [[u, w, v] for (u, w), v in self.middle.items()],
+            }, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        rank = {node: order for node, order in data["rank"]}
+        up = {node: {} for node in rank}
+        down = {node: {} for node in rank}
+        for u, v, w in data["up"]:
+            up[u][v] = w
+        for v, u, w in data["down"]:
+            down[v][u] = w
+        middle = {(u, w): v for u, w, v in data["middle"]}
+        return cls(rank, up, down, middle)
+
+
+def benchmark(width=60, height=60, queries=200, seed=0):
+    """Report preprocessing time, memory and query speedup on a grid graph."""
+    graph = grid_graph(width, height, seed=seed)
+    edges = sum(len(e) for e in graph.values())
+    print(f"Grid: {width}x{height}, {len(graph)} nodes, {edges} edges")
+
+    stats = {}
+    start = time.perf_counter()
+    hierarchy = ContractionHierarchy.build(graph, stats=stats)
+    print(f"Preprocessing: {time.perf_counter() - start:.1f}s, "
+          f"{stats['shortcuts']} shortcuts, {stats['edges']} hierarchy edges")
+
+    # measure the hierarchy as a restarted process would see it: loaded from disk
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "hierarchy.json")
+        hierarchy.save(path)
+        tracemalloc.start()
+        start = time.perf_counter()
+        hierarchy = ContractionHierarchy.load(path)
+        loaded = time.perf_counter() - start
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"Saved: {os.path.getsize(path) / 2**20:.1f} MiB on disk, loads in {loaded:.2f}s "
+              f"into {size / 2**20:.1f} MiB")
+
+    rng = random.Random(seed)
+    nodes = list(graph)
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(queries)]
+    reverse = reverse_graph(graph)
+    baseline = None
+    for name, run in (("shortest_path", lambda s, t, st: shortest_path(graph, s, t, st)),
+                      ("bidirectional", lambda s, t, st: bidirectional_dijkstra(graph, s, t, reverse, st)),
+                      ("CH", lambda s, t, st: hierarchy.shortest_path(s, t, st))):
+        settled = 0
+        start = time.perf_counter()
+        for source, target in pairs:
+            st = {}
+            run(source, target, st)
+            settled += st['settled']
+        per_query = (time.perf_counter() - start) / queries
+        baseline = baseline or per_query
+        print(f"{name:>14}: {settled / queries:8.0f} settled, {per_query * 1e3:7.2f} ms per query, "
+              f"{baseline / per_query:5.1f}x")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Contraction hierarchy benchmark")
+    parser.add_argument("--width", type=int, default=60)
+    parser.add_argument("--height", type=int, default=60)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    benchmark(args.width, args.height, args.queries)
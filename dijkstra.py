@@ -1,6 +1,125 @@
 import heapq
+import json
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 
-def dijkstra(graph, source):
+class BinaryHeapQueue:
+    """heapq with lazy deletion: stale entries are skipped by the caller."""
+
+    def __init__(self):
+        self.heap = []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, key, item):
+        heapq.heappush(self.heap, (key, item))
+
+    def pop(self):
+        return heapq.heappop(self.heap)
+
+class BucketQueue:
+    """Dial's algorithm: a ring of max_weight + 1 buckets for monotone integer keys.
+
+    Every key in the queue lies in [current, current + max_weight], so the
+    ring never wraps onto a live bucket and pop() only scans forward.
+    """
+
+    def __init__(self, max_weight):
+        self.buckets = [[] for _ in range(max_weight + 1)]
+        self.current = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, key, item):
+        self.buckets[key % len(self.buckets)].append(item)
+        self.size += 1
+
+    def pop(self):
+        buckets, ring = self.buckets, len(self.buckets)
+        while not buckets[self.current % ring]:
+            self.current += 1
+        self.size -= 1
+        return self.current, buckets[self.current % ring].pop()
+
+class RadixHeapQueue:
+    """Radix heap for monotone integer keys.
+
+    Bucket i holds keys whose highest bit differing from the last popped key
+    is bit i - 1, so each entry moves to a lower bucket at most log(C) times.
+    """
+
+    def __init__(self):
+        self.buckets = [[]]
+        self.last = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, key, item):
+        index = (key ^ self.last).bit_length()
+        while index >= len(self.buckets):
+            self.buckets.append([])
+        self.buckets[index].append((key, item))
+        self.size += 1
+
+    def pop(self):
+        buckets = self.buckets
+        if not buckets[0]:
+            index = 1
+            while not buckets[index]:
+                index += 1
+            entries = buckets[index]
+            buckets[index] = []
+            self.last = min(entries)[0]
+            for entry in entries:
+                buckets[(entry[0] ^ self.last).bit_length()].append(entry)
+        self.size -= 1
+        return buckets[0].pop()
+
+def _weight_profile(graph):
+    """Return (max edge weight, whether every weight is a non-negative int)."""
+    max_weight, integral = 0, True
+    for edges in graph.values():
+        for weight in edges.values():
+            if weight > max_weight:
+                max_weight = weight
+            if integral and not (isinstance(weight, int) and weight >= 0):
+                integral = False
+    return max_weight, integral
+
+# Measured with `python dijkstra.py --queues`: Dial's bucket ring beats heapq up
+# to weights around 10^5 and loses badly beyond. The radix heap only beat the
+# C heapq at weights where Dial was faster still, so auto never picks it.
+DIAL_MAX_WEIGHT = 100_000
+
+def choose_queue(graph):
+    """Pick a queue name for graph from its maximum edge weight."""
+    max_weight, integral = _weight_profile(graph)
+    return "dial" if integral and max_weight <= DIAL_MAX_WEIGHT else "heap"
+
+QUEUES = {
+    "heap": lambda max_weight: BinaryHeapQueue(),
+    "dial": BucketQueue,
+    "radix": lambda max_weight: RadixHeapQueue(),
+}
+
+def dijkstra(graph, source, queue="heap"):
+    """Distances from source to every node of graph.
+
+    queue selects the priority queue: "heap" (binary heap), "dial" (bucket
+    queue) or "radix" (radix heap); the last two need non-negative integer
+    weights. "auto" picks one from the graph's weights via choose_queue().
+    """
+    if queue != "heap":
+        return _dijkstra_with_queue(graph, source, queue)
     distances = {node: float('inf') for node in graph}
     distances[source] = 0
     queue = [(0, source)]
@@ -15,6 +134,677 @@ def dijkstra(graph, source):
                 heapq.heappush(queue, (distance, neighbor))
     return distances
 
+def _dijkstra_with_queue(graph, source, queue):
+    if queue == "auto":
+        queue = choose_queue(graph)
+    if queue not in QUEUES:
+        raise ValueError(f"Unknown queue {queue!r}, expected 'auto' or one of {sorted(QUEUES)}")
+    distances = {node: float('inf') for node in graph}
+    distances[source] = 0
+    frontier = QUEUES[queue](_weight_profile(graph)[0])
+    frontier.push(0, source)
+    while frontier:
+        current_distance, current_node = frontier.pop()
+        if current_distance > distances[current_node]:
+            continue
+        for neighbor, weight in graph[current_node].items():
+            distance = current_distance + weight
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                frontier.push(distance, neighbor)
+    return distances
+
+def _build_path(predecessors, target):
+    path = [target]
+    while predecessors[path[-1]] is not None:
+        path.append(predecessors[path[-1]])
+    path.reverse()
+    return path
+
+def shortest_path(graph, source, target, stats=None):
+    """Dijkstra that stops once target is settled.
+
+    Returns (distance, [source, ..., target]), or (inf, []) when target is
+    unreachable. If stats is a dict, stats['settled'] gets the number of
+    nodes settled.
+    """
+    distances = {source: 0}
+    predecessors = {source: None}
+    settled = set()
+    queue = [(0, source)]
+    while queue:
+        current_distance, current_node = heapq.heappop(queue)
+        if current_node in settled:
+            continue
+        settled.add(current_node)
+        if current_node == target:
+            break
+        for neighbor, weight in graph.get(current_node, {}).items():
+            distance = current_distance + weight
+            if distance < distances.get(neighbor, float('inf')):
+                distances[neighbor] = distance
+                predecessors[neighbor] = current_node
+                heapq.heappush(queue, (distance, neighbor))
+    if stats is not None:
+        stats['settled'] = len(settled)
+    if target not in settled:
+        return float('inf'), []
+    return distances[target], _build_path(predecessors, target)
+
+def reverse_graph(graph):
+    """Return the graph with every edge u -> v turned into v -> u."""
+    reverse = {node: {} for node in graph}
+    for node, edges in graph.items():
+        for neighbor, weight in edges.items():
+            reverse.setdefault(neighbor, {})[node] = weight
+    return reverse
+
+def bidirectional_dijkstra(graph, source, target, reverse=None, stats=None):
+    """Point-to-point search run from both ends at once.
+
+    reverse is reverse_graph(graph); pass it in when answering many queries
+    on the same graph. Returns the same (distance, path) as shortest_path().
+    """
+    if source == target:
+        if stats is not None:
+            stats['settled'] = 1
+        return 0, [source]
+    if reverse is None:
+        reverse = reverse_graph(graph)
+
+    graphs = (graph, reverse)
+    distances = ({source: 0}, {target: 0})
+    predecessors = ({source: None}, {target: None})
+    settled = (set(), set())
+    queues = ([(0, source)], [(0, target)])
+    best, meeting = float('inf'), None
+
+    while queues[0] and queues[1]:
+        # the two frontiers can no longer improve on the best connection found
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        current_distance, current_node = heapq.heappop(queues[side])
+        if current_node in settled[side]:
+            continue
+        settled[side].add(current_node)
+        other = distances[1 - side]
+        for neighbor, weight in graphs[side].get(current_node, {}).items():
+            distance = current_distance + weight
+            if distance < distances[side].get(neighbor, float('inf')):
+                distances[side][neighbor] = distance
+                predecessors[side][neighbor] = current_node
+                heapq.heappush(queues[side], (distance, neighbor))
+            if neighbor in other and distance + other[neighbor] < best:
+                best, meeting = distance + other[neighbor], (side, current_node, neighbor)
+
+    if stats is not None:
+        stats['settled'] = len(settled[0]) + len(settled[1])
+    if meeting is None:
+        return float('inf'), []
+
+    # meeting is the edge that joined the two searches; stitch both halves together
+    side, u, v = meeting
+    forward_end, backward_start = (u, v) if side == 0 else (v, u)
+    path = _build_path(predecessors[0], forward_end)
+    node = backward_start
+    while node is not None:
+        path.append(node)
+        node = predecessors[1][node]
+    return best, path
+
+def astar(graph, source, target, heuristic, stats=None):
+    """A* search; heuristic(node) must never overestimate the distance to target.
+
+    Returns (distance, path) like shortest_path().
+    """
+    distances = {source: 0}
+    predecessors = {source: None}
+    settled = set()
+    queue = [(heuristic(source), source)]
+    while queue:
+        _, current_node = heapq.heappop(queue)
+        if current_node in settled:
+            continue
+        settled.add(current_node)
+        if current_node == target:
+            break
+        current_distance = distances[current_node]
+        for neighbor, weight in graph.get(current_node, {}).items():
+            distance = current_distance + weight
+            if distance < distances.get(neighbor, float('inf')):
+                estimate = heuristic(neighbor)
+                if estimate == float('inf'):
+                    continue  # target is provably unreachable from neighbor
+                distances[neighbor] = distance
+                predecessors[neighbor] = current_node
+                heapq.heappush(queue, (distance + estimate, neighbor))
+    if stats is not None:
+        stats['settled'] = len(settled)
+    if target not in settled:
+        return float('inf'), []
+    return distances[target], _build_path(predecessors, target)
+
+def _random_landmarks(graph, count, reverse, rng):
+    return rng.sample(list(graph), min(count, len(graph)))
+
+def _degree_landmarks(graph, count, reverse, rng):
+    return sorted(graph, key=lambda node: len(graph[node]) + len(reverse.get(node, {})), reverse=True)[:count]
+
+def _farthest_landmarks(graph, count, reverse, rng):
+    # start far from a random node, then keep adding the node farthest from
+    # every landmark chosen so far
+    distances = dijkstra(graph, rng.choice(list(graph)))
+    nearest = {node: d for node, d in distances.items() if d != float('inf')}
+    landmarks = []
+    while len(landmarks) < count and nearest:
+        landmark = max(nearest, key=nearest.get)
+        landmarks.append(landmark)
+        del nearest[landmark]
+        for node, d in dijkstra(graph, landmark).items():
+            if node in nearest and d < nearest[node]:
+                nearest[node] = d
+    return landmarks
+
+LANDMARK_STRATEGIES = {
+    "random": _random_landmarks,
+    "degree": _degree_landmarks,
+    "farthest": _farthest_landmarks,
+}
+
+def select_landmarks(graph, count, strategy="farthest", reverse=None, seed=0):
+    """Pick landmark nodes for ALTIndex using one of LANDMARK_STRATEGIES."""
+    if strategy not in LANDMARK_STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}, expected one of {sorted(LANDMARK_STRATEGIES)}")
+    if reverse is None:
+        reverse = reverse_graph(graph)
+    return LANDMARK_STRATEGIES[strategy](graph, count, reverse, random.Random(seed))
+
+class ALTIndex:
+    """Landmark distances for A* with triangle-inequality lower bounds (ALT).
+
+    For every landmark L the index stores d(L, v) and d(v, L) for all nodes,
+    and d(v, t) >= max(d(L, t) - d(L, v), d(v, L) - d(t, L)).
+    """
+
+    def __init__(self, landmarks, from_landmarks, to_landmarks):
+        self.landmarks = landmarks
+        self.from_landmarks = from_landmarks  # one {node: d(L, node)} per landmark
+        self.to_landmarks = to_landmarks      # one {node: d(node, L)} per landmark
+        # node -> (d(L1, node), ..., d(Lk, node), d(node, L1), ..., d(node, Lk))
+        inf = float('inf')
+        nodes = set().union(*from_landmarks, *to_landmarks)
+        self.vectors = {node: tuple([d.get(node, inf) for d in from_landmarks] +
+                                    [d.get(node, inf) for d in to_landmarks])
+                        for node in nodes}
+
+    @classmethod
+    def build(cls, graph, landmarks, reverse=None):
+        """Run dijkstra() from every landmark on the graph and its reverse."""
+        if reverse is None:
+            reverse = reverse_graph(graph)
+        return cls(list(landmarks),
+                   [dijkstra(graph, landmark) for landmark in landmarks],
+                   [dijkstra(reverse, landmark) for landmark in landmarks])
+
+    def _bounds(self, vector, target_vector, landmarks):
+        count = len(self.landmarks)
+        best = 0
+        for i in landmarks:
+            # inf - finite = inf means the target is provably unreachable;
+            # finite - inf and inf - inf (nan) never pass the comparison
+            bound = target_vector[i] - vector[i]
+            if bound > best:
+                best = bound
+            bound = vector[count + i] - target_vector[count + i]
+            if bound > best:
+                best = bound
+        return best
+
+    def heuristic(self, target, source=None, active=None):
+        """Return a lower-bound function h(node) on the distance node -> target.
+
+        With source and active given, only the `active` landmarks that give
+        the tightest bound at the source are consulted, which keeps h cheap.
+        """
+        landmarks = range(len(self.landmarks))
+        target_vector = self.vectors.get(target)
+        if target_vector is None:
+            return lambda node: 0
+        source_vector = self.vectors.get(source)
+        if active is not None and source_vector is not None and active < len(self.landmarks):
+            landmarks = sorted(landmarks, key=lambda i: self._bounds(source_vector, target_vector, [i]),
+                               reverse=True)[:active]
+        vectors = self.vectors
+        bounds = self._bounds
+
+        def h(node):
+            vector = vectors.get(node)
+            return 0 if vector is None else bounds(vector, target_vector, landmarks)
+        return h
+
+    def shortest_path(self, graph, source, target, stats=None, active=4):
+        """A* query guided by the landmark bounds; returns (distance, path)."""
+        return astar(graph, source, target, self.heuristic(target, source, active), stats)
+
+    def save(self, path):
+        nodes = list(self.from_landmarks[0]) if self.from_landmarks else []
+        inf = float('inf')
+        with open(path, 'w') as f:
+            json.dump({
+                "landmarks": self.landmarks,
+                "nodes": nodes,
+                "from": [[d.get(node, inf) for node in nodes] for d in self.from_landmarks],
+                "to": [[d.get(node, inf) for node in nodes] for d in self.to_landmarks],
+            }, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        nodes = data["nodes"]
+        return cls(data["landmarks"],
+                   [dict(zip(nodes, row)) for row in data["from"]],
+                   [dict(zip(nodes, row)) for row in data["to"]])
+
+class DynamicShortestPaths:
+    """Single-source distances kept up to date while edge weights change.
+
+    Seeded from a dijkstra() result, it keeps the shortest-path tree. An
+    update only repairs the part of the tree it affects: a cheaper edge
+    starts a Dijkstra from its head, and a dearer (or removed) tree edge
+    resets the subtree below it and re-attaches it from the rest of the tree.
+    """
+
+    def __init__(self, graph, source, distances=None):
+        self.graph = {node: dict(edges) for node, edges in graph.items()}
+        self.reverse = reverse_graph(self.graph)
+        for node in self.reverse:
+            self.graph.setdefault(node, {})
+        self.source = source
+        if distances is None:
+            distances = dijkstra(self.graph, source)
+        self.distances = {node: distances.get(node, float('inf')) for node in self.graph}
+        self.parent = {source: None}
+        self.children = {node: set() for node in self.graph}
+        # walk tight edges breadth-first so zero-weight edges can't form parent cycles
+        frontier = [source]
+        for node in frontier:
+            for neighbor, weight in self.graph[node].items():
+                if neighbor not in self.parent and self.distances[node] + weight == self.distances[neighbor]:
+                    self._set_parent(neighbor, node)
+                    frontier.append(neighbor)
+
+    def _set_parent(self, node, parent):
+        old = self.parent.get(node)
+        if old is not None:
+            self.children[old].discard(node)
+        self.parent[node] = parent
+        if parent is not None:
+            self.children[parent].add(node)
+
+    def _add_node(self, node):
+        if node not in self.graph:
+            self.graph[node] = {}
+            self.reverse[node] = {}
+            self.distances[node] = float('inf')
+            self.children[node] = set()
+
+    def update_edge(self, u, v, weight):
+        """Set the weight of edge u -> v (adding it if needed); weight None removes it."""
+        self._add_node(u)
+        self._add_node(v)
+        old = self.graph[u].get(v, float('inf'))
+        new = float('inf') if weight is None else weight
+        if weight is None:
+            self.graph[u].pop(v, None)
+            self.reverse[v].pop(u, None)
+        else:
+            self.graph[u][v] = weight
+            self.reverse[v][u] = weight
+
+        if new < old:
+            if self.distances[u] + new < self.distances[v]:
+                self.distances[v] = self.distances[u] + new
+                self._set_parent(v, u)
+                self._propagate([(self.distances[v], v)])
+        elif new > old and self.parent.get(v) == u:
+            self._reattach_subtree(v)
+
+    def update_edges(self, updates):
+        """Apply an iterable of (u, v, weight) updates in order."""
+        for u, v, weight in updates:
+            self.update_edge(u, v, weight)
+
+    def _reattach_subtree(self, root):
+        inf = float('inf')
+        subtree = [root]
+        for node in subtree:
+            subtree.extend(self.children[node])
+        affected = set(subtree)
+        for node in subtree:
+            self.distances[node] = inf
+        for node in subtree:
+            self._set_parent(node, None)
+            del self.parent[node]
+
+        # best entry point into each affected node from the untouched part of the tree
+        queue = []
+        for node in subtree:
+            best, best_parent = inf, None
+            for neighbor, weight in self.reverse[node].items():
+                if neighbor not in affected and self.distances[neighbor] + weight < best:
+                    best, best_parent = self.distances[neighbor] + weight, neighbor
+            if best_parent is not None:
+                self.distances[node] = best
+                self._set_parent(node, best_parent)
+                queue.append((best, node))
+        heapq.heapify(queue)
+        self._propagate(queue)
+
+    def _propagate(self, queue):
+        """Dijkstra from the given (distance, node) entries, fixing everything they improve."""
+        distances = self.distances
+        while queue:
+            current_distance, current_node = heapq.heappop(queue)
+            if current_distance > distances[current_node]:
+                continue
+            for neighbor, weight in self.graph[current_node].items():
+                distance = current_distance + weight
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    self._set_parent(neighbor, current_node)
+                    heapq.heappush(queue, (distance, neighbor))
+
+class CSRGraph:
+    """Graph with integer node ids and adjacency stored in compressed sparse rows.
+
+    The out-edges of node u are targets[offsets[u]:offsets[u + 1]] with the
+    matching weights; labels[u] is the original label and index maps back.
+    """
+
+    def __init__(self, labels, offsets, targets, weights):
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    def __len__(self):
+        return len(self.labels)
+
+    def edge_count(self):
+        return len(self.targets)
+
+    def to_dict(self, values):
+        """Map a per-id list (e.g. dijkstra_csr distances) back to labels."""
+        return {label: values[i] for i, label in enumerate(self.labels)}
+
+def build_csr(graph):
+    """Intern the labels of a dict-of-dicts graph and pack its edges into a CSRGraph."""
+    labels = list(graph)
+    index = {label: i for i, label in enumerate(labels)}
+    for edges in graph.values():
+        for neighbor in edges:
+            if neighbor not in index:
+                index[neighbor] = len(labels)
+                labels.append(neighbor)
+
+    offsets = array('q', [0])
+    targets = array('q')
+    # int weights stay ints, so distances are exact beyond 2**53
+    max_weight, integral = _weight_profile(graph)
+    weights = array('q' if integral and max_weight < 2**63 else 'd')
+    for label in labels:
+        for neighbor, weight in graph.get(label, {}).items():
+            targets.append(index[neighbor])
+            weights.append(weight)
+        offsets.append(len(targets))
+    return CSRGraph(labels, offsets, targets, weights)
+
+def dijkstra_csr(csr, source):
+    """dijkstra() over a CSRGraph; returns a list of distances indexed by node id."""
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    distances = [float('inf')] * len(csr)
+    start = csr.index[source]
+    distances[start] = 0
+    queue = [(0, start)]
+    while queue:
+        current_distance, current_node = heapq.heappop(queue)
+        if current_distance > distances[current_node]:
+            continue
+        for edge in range(offsets[current_node], offsets[current_node + 1]):
+            neighbor = targets[edge]
+            distance = current_distance + weights[edge]
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                heapq.heappush(queue, (distance, neighbor))
+    return distances
+
+def _dijkstra_to_targets(offsets, targets, weights, nodes, source, wanted):
+    """Distances from source to each id in wanted, stopping once all are settled."""
+    distances = [float('inf')] * nodes
+    distances[source] = 0
+    remaining = set(wanted)
+    queue = [(0, source)]
+    while queue and remaining:
+        current_distance, current_node = heapq.heappop(queue)
+        if current_distance > distances[current_node]:
+            continue
+        remaining.discard(current_node)
+        for edge in range(offsets[current_node], offsets[current_node + 1]):
+            neighbor = targets[edge]
+            distance = current_distance + weights[edge]
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                heapq.heappush(queue, (distance, neighbor))
+    return [distances[target] for target in wanted]
+
+# Per-worker view of the CSR arrays placed in shared memory by distance_matrix()
+_shared = {}
+
+def _attach_shared(blocks, nodes, wanted):
+    views = []
+    for name, typecode, count in blocks:
+        block = shared_memory.SharedMemory(name=name)
+        _shared.setdefault('blocks', []).append(block)
+        views.append(block.buf[:count * array(typecode).itemsize].cast(typecode))
+    _shared['csr'] = views
+    _shared['nodes'] = nodes
+    _shared['wanted'] = wanted
+
+def _matrix_row(source):
+    offsets, targets, weights = _shared['csr']
+    return _dijkstra_to_targets(offsets, targets, weights, _shared['nodes'], source, _shared['wanted'])
+
+def distance_matrix(graph, sources, targets, workers=None):
+    """Shortest distances from every source to every target.
+
+    graph is a dict-of-dicts graph or a CSRGraph. Each source is searched in
+    its own task on a pool of `workers` processes (default: all cores), which
+    read the CSR arrays from shared memory instead of receiving a pickled
+    copy. Returns one row per source, with one column per target.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else build_csr(graph)
+    source_ids = [csr.index[source] for source in sources]
+    wanted = [csr.index[target] for target in targets]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(source_ids) <= 1:
+        return [_dijkstra_to_targets(csr.offsets, csr.targets, csr.weights, len(csr), source, wanted)
+                for source in source_ids]
+
+    blocks = []
+    try:
+        for values in (csr.offsets, csr.targets, csr.weights):
+            nbytes = len(values) * values.itemsize
+            block = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+            block.buf[:nbytes] = values.tobytes()
+            blocks.append(block)
+        spec = [(block.name, values.typecode, len(values))
+                for block, values in zip(blocks, (csr.offsets, csr.targets, csr.weights))]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_shared,
+                                 initargs=(spec, len(csr), wanted)) as pool:
+            chunksize = max(1, len(source_ids) // (workers * 4))
+            return list(pool.map(_matrix_row, source_ids, chunksize=chunksize))
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+def random_graph(nodes, edges, max_weight=100, seed=0):
+    """Random directed dict-of-dicts graph with string labels and int weights."""
+    rng = random.Random(seed)
+    labels = [f"n{i}" for i in range(nodes)]
+    graph = {label: {} for label in labels}
+    # a ring keeps every node reachable from every other one
+    for i, label in enumerate(labels):
+        graph[label][labels[(i + 1) % nodes]] = rng.randint(1, max_weight)
+    added = nodes
+    while added < edges:
+        u, v = rng.randrange(nodes), rng.randrange(nodes)
+        if u != v and labels[v] not in graph[labels[u]]:
+            graph[labels[u]][labels[v]] = rng.randint(1, max_weight)
+            added += 1
+    return graph
+
+def grid_graph(width, height, max_weight=10, seed=0):
+    """Road-like test graph: a width x height grid with two-way random-weight streets."""
+    rng = random.Random(seed)
+    graph = {f"{x},{y}": {} for x in range(width) for y in range(height)}
+    for x in range(width):
+        for y in range(height):
+            for nx, ny in ((x + 1, y), (x, y + 1)):
+                if nx < width and ny < height:
+                    weight = rng.randint(1, max_weight)
+                    graph[f"{x},{y}"][f"{nx},{ny}"] = weight
+                    graph[f"{nx},{ny}"][f"{x},{y}"] = weight
+    return graph
+
+def benchmark(nodes=100_000, edges=1_000_000, runs=3, seed=0):
+    """Compare dict-of-dicts dijkstra() against dijkstra_csr() on a random graph."""
+    graph = random_graph(nodes, edges, seed=seed)
+    print(f"Graph: {nodes} nodes, {edges} edges")
+
+    start = time.perf_counter()
+    csr = build_csr(graph)
+    print(f"build_csr: {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(seed)
+    sources = [f"n{rng.randrange(nodes)}" for _ in range(runs)]
+    for name, run in (("dict", lambda s: dijkstra(graph, s)),
+                      ("csr", lambda s: dijkstra_csr(csr, s))):
+        start = time.perf_counter()
+        for source in sources:
+            run(source)
+        print(f"{name:>5}: {(time.perf_counter() - start) / runs:.2f}s per source")
+
+def p2p_benchmark(nodes=100_000, edges=1_000_000, queries=20, seed=0):
+    """Compare settled nodes and latency of full, early-exit and bidirectional search."""
+    graph = random_graph(nodes, edges, seed=seed)
+    reverse = reverse_graph(graph)
+    rng = random.Random(seed)
+    pairs = [(f"n{rng.randrange(nodes)}", f"n{rng.randrange(nodes)}") for _ in range(queries)]
+    print(f"Graph: {nodes} nodes, {edges} edges, {queries} random queries")
+
+    def full(source, target, stats):
+        distances = dijkstra(graph, source)
+        stats['settled'] = sum(1 for d in distances.values() if d != float('inf'))
+
+    for name, run in (("dijkstra", full),
+                      ("shortest_path", lambda s, t, st: shortest_path(graph, s, t, st)),
+                      ("bidirectional", lambda s, t, st: bidirectional_dijkstra(graph, s, t, reverse, st))):
+        settled = 0
+        start = time.perf_counter()
+        for source, target in pairs:
+            stats = {}
+            run(source, target, stats)
+            settled += stats['settled']
+        elapsed = (time.perf_counter() - start) / queries
+        print(f"{name:>14}: {settled / queries:10.0f} settled, {elapsed * 1e3:8.1f} ms per query")
+
+def alt_benchmark(width=300, height=300, landmarks=8, queries=30, seed=0):
+    """Compare early-exit Dijkstra with ALT queries for each landmark strategy."""
+    graph = grid_graph(width, height, seed=seed)
+    reverse = reverse_graph(graph)
+    rng = random.Random(seed)
+    nodes = list(graph)
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(queries)]
+    print(f"Grid: {width}x{height}, {landmarks} landmarks, {queries} random queries")
+
+    def run(name, query, baseline=None):
+        settled = 0
+        start = time.perf_counter()
+        for source, target in pairs:
+            stats = {}
+            query(source, target, stats)
+            settled += stats['settled']
+        elapsed = (time.perf_counter() - start) / queries
+        speedup = f", {baseline / elapsed:4.1f}x faster" if baseline else ""
+        print(f"{name:>16}: {settled / queries:8.0f} settled, {elapsed * 1e3:7.1f} ms per query{speedup}")
+        return elapsed
+
+    baseline = run("shortest_path", lambda s, t, st: shortest_path(graph, s, t, st))
+    for strategy in LANDMARK_STRATEGIES:
+        start = time.perf_counter()
+        index = ALTIndex.build(graph, select_landmarks(graph, landmarks, strategy, reverse, seed), reverse)
+        print(f"{'':>16}  {strategy} landmarks precomputed in {time.perf_counter() - start:.1f}s")
+        run(f"ALT ({strategy})", lambda s, t, st: index.shortest_path(graph, s, t, st), baseline)
+
+def matrix_benchmark(nodes=50_000, edges=250_000, sources=32, targets=200, seed=0):
+    """Time distance_matrix() with 1 .. cpu_count() worker processes."""
+    csr = build_csr(random_graph(nodes, edges, seed=seed))
+    rng = random.Random(seed)
+    source_labels = rng.sample(csr.labels, sources)
+    target_labels = rng.sample(csr.labels, targets)
+    print(f"Graph: {nodes} nodes, {edges} edges; {sources} x {targets} matrix")
+
+    baseline = None
+    counts = sorted({1, 2, 4, os.cpu_count() or 1} & set(range(1, (os.cpu_count() or 1) + 1)))
+    for workers in counts:
+        start = time.perf_counter()
+        distance_matrix(csr, source_labels, target_labels, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>3} workers: {elapsed:6.2f}s ({baseline / elapsed:4.1f}x)")
+
+def queue_benchmark(nodes=100_000, edges=400_000, weights=(1, 10, 100, 1_000, 10_000, 100_000, 1_000_000), seed=0):
+    """Time dijkstra() with every priority queue across maximum edge weights."""
+    print(f"Graph: {nodes} nodes, {edges} edges")
+    print(f"{'max weight':>10} " + " ".join(f"{name:>8}" for name in QUEUES) + "   auto picks")
+    for max_weight in weights:
+        graph = random_graph(nodes, edges, max_weight=max_weight, seed=seed)
+        timings = []
+        for name in QUEUES:
+            start = time.perf_counter()
+            dijkstra(graph, "n0", queue=name)
+            timings.append(time.perf_counter() - start)
+        print(f"{max_weight:>10} " + " ".join(f"{t:7.2f}s" for t in timings) + f"   {choose_queue(graph)}")
+
+def dynamic_benchmark(nodes=100_000, edges=400_000, batches=(1, 100, 10_000), seed=0):
+    """Time DynamicShortestPaths repairs against a full dijkstra() per batch of updates."""
+    graph = random_graph(nodes, edges, seed=seed)
+    rng = random.Random(seed)
+    edge_list = [(u, v) for u, out in graph.items() for v in out]
+    dynamic = DynamicShortestPaths(graph, "n0")
+    print(f"Graph: {nodes} nodes, {edges} edges")
+    for size in batches:
+        batch = []
+        for u, v in rng.sample(edge_list, size):
+            weight = dynamic.graph[u][v]
+            # half of the updates are traffic jams, half are roads clearing up
+            batch.append((u, v, weight * 2 if rng.random() < 0.5 else max(1, weight // 2)))
+
+        start = time.perf_counter()
+        dynamic.update_edges(batch)
+        repaired = time.perf_counter() - start
+        start = time.perf_counter()
+        expected = dijkstra(dynamic.graph, "n0")
+        full = time.perf_counter() - start
+        assert expected == dynamic.distances
+        print(f"{size:>6} updates: repair {repaired * 1e3:9.1f} ms, recompute {full * 1e3:8.1f} ms "
+              f"({full / repaired:6.1f}x)")
+
 def create_graph():
     graph = {}
     nodes = int(input("Enter the number of nodes in the graph: "))
@@ -38,7 +828,34 @@ def create_graph():
     return graph
 
 if __name__ == "__main__":
-    graph = create_graph()
-    source_node = input("Enter the source node: ")
-    result = dijkstra(graph, source_node)
-    print(f"Shortest distances from source node {source_node}: {result}")
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Dijkstra's shortest paths")
+    parser.add_argument("--bench", action="store_true", help="benchmark dict vs CSR dijkstra")
+    parser.add_argument("--p2p", action="store_true", help="benchmark point-to-point searches")
+    parser.add_argument("--alt", action="store_true", help="benchmark ALT landmark queries on a grid")
+    parser.add_argument("--matrix", action="store_true", help="benchmark distance_matrix worker scaling")
+    parser.add_argument("--queues", action="store_true", help="compare heap, Dial and radix heap queues")
+    parser.add_argument("--dynamic", action="store_true", help="benchmark incremental repairs vs recomputation")
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    if args.bench or args.p2p or args.alt or args.matrix or args.queues or args.dynamic:
+        if args.bench:
+            benchmark(args.nodes, args.edges)
+        if args.p2p:
+            p2p_benchmark(args.nodes, args.edges)
+        if args.alt:
+            alt_benchmark()
+        if args.matrix:
+            matrix_benchmark()
+        if args.queues:
+            queue_benchmark()
+        if args.dynamic:
+            dynamic_benchmark()
+    else:
+        graph = create_graph()
+        source_node = input("Enter the source node: ")
+        result = dijkstra(graph, source_node)
+        print(f"Shortest distances from source node {source_node}: {result}")
@@ -12,6 +12,17 @@ Author: [Your Name]
 Date: October 2025
 """
 
+import heapq
+import io
+import random
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate, repeat
+from operator import mul, sub
+
 
 def determineMaxDataFlow(bandwidth, streamCount):
     """
@@ -28,6 +39,141 @@ def determineMaxDataFlow(bandwidth, streamCount):
     - Pairs (x, y) and (y, x) are considered different connections
     - A node can be paired with itself
     
+    Instead of generating all n^2 pair sums, binary search for the threshold T,
+    the largest sum such that at least streamCount pairs have a sum >= T. Every
+    pair with a sum > T is selected, and the remaining channels take pairs whose
+    sum is exactly T. For each x, the partners y with x + y >= T form a suffix
+    of the sorted bandwidths, so counting and summing them needs one index
+    lookup per node plus prefix sums.
+    
+    Args:
+        bandwidth (list): Array of bandwidth capability provided by each processing node
+        streamCount (int): Number of data channels that needs to be connected
+        
+    Returns:
+        int: The maximum total dataFlow from the unique connections of node pairs
+        
+    Complexity:
+        O(n log n + n log V) time and O(n) space, where V is
+        max(bandwidth) - min(bandwidth) (the index lookups use a table of
+        size O(V) instead of bisect when V <= TABLE_SPAN_FACTOR * n)
+        
+    Constraints:
+        - 1 ≤ n ≤ 2 * 10^5
+        - 1 ≤ bandwidth[i] ≤ 2 * 10^5
+        - 1 ≤ streamCount ≤ min(n^2, n^2)
+    """
+    n = len(bandwidth)
+    streamCount = min(streamCount, n * n)
+    if streamCount <= 0:
+        return 0
+    
+    values = sorted(bandwidth)
+    first_at_least = _pair_index_finder(values)
+    
+    low, high = 2 * values[0], 2 * values[-1]
+    while low < high:
+        mid = (low + high + 1) // 2
+        if n * n - sum(first_at_least(mid)) >= streamCount:
+            low = mid
+        else:
+            high = mid - 1
+    threshold = low
+    
+    # Take every pair strictly above the threshold, then fill up with pairs equal to it
+    first = list(first_at_least(threshold + 1))
+    prefix = [0, *accumulate(values)]
+    above = sum(map(mul, map(sub, repeat(n, n), first), values))
+    above += n * prefix[-1] - sum(map(prefix.__getitem__, first))
+    return above + (streamCount - (n * n - sum(first))) * threshold
+
+
+# Above this ratio of value range to n, a lookup table costs more to build than bisect saves
+TABLE_SPAN_FACTOR = 8
+
+
+def _pair_index_finder(values):
+    """
+    Return first_at_least(threshold), an iterator that gives, for each x in
+    the sorted list values, the index of the first y with x + y >= threshold.
+    
+    When the value range is small relative to n, the answers are read from a
+    table over every value threshold - x can take; otherwise each one is a
+    bisect. Either way the loop runs in C via map().
+    """
+    n = len(values)
+    lo, hi = values[0], values[-1]
+    span = hi - lo
+    if span > TABLE_SPAN_FACTOR * n:
+        return lambda threshold: map(bisect_left, repeat(values, n), map(sub, repeat(threshold, n), values))
+    
+    # table[v + offset] == bisect_left(values, v) for v in [lo - span, hi + span + 1]
+    occurrences = Counter(values)
+    below = accumulate((occurrences.get(v, 0) for v in range(lo, hi)), initial=0)
+    table = [0] * span + list(below) + [n] * (span + 1)
+    lookup = table.__getitem__
+    offset = span - lo
+    return lambda threshold: map(lookup, map(sub, repeat(threshold + offset, n), values))
+
+
+def iter_top_pairs(bandwidth):
+    """
+    Lazily yield node pairs in descending order of dataFlow.
+    
+    Each item is (i, j, dataFlow) with i and j indices into bandwidth, so the
+    first streamCount items are exactly the connections determineMaxDataFlow
+    selects. Pairs with equal dataFlow come out in a fixed but unspecified
+    order.
+    
+    Nodes are sorted by bandwidth (descending) and each row r of the sorted
+    order is a list of pairs (r, 0), (r, 1), ... that is already descending.
+    A heap holds the next pair of every row that has been started; row r + 1
+    is only started once (r, 0) has been yielded, because nothing in it can be
+    larger before that.
+    
+    Args:
+        bandwidth (list): Array of bandwidth capability provided by each processing node
+        
+    Yields:
+        tuple: (main node index, secondary node index, dataFlow)
+        
+    Complexity:
+        O(n log n) to start, then O(log n) per item; O(n) memory
+    """
+    n = len(bandwidth)
+    if n == 0:
+        return
+    order = sorted(range(n), key=bandwidth.__getitem__, reverse=True)
+    values = [bandwidth[i] for i in order]
+    frontier = [(-2 * values[0], 0, 0)]
+    while frontier:
+        negative, row, col = frontier[0]
+        yield order[row], order[col], -negative
+        if col + 1 < n:
+            heapq.heapreplace(frontier, (-(values[row] + values[col + 1]), row, col + 1))
+        else:
+            heapq.heappop(frontier)
+        if col == 0 and row + 1 < n:
+            heapq.heappush(frontier, (-(values[row + 1] + values[0]), row + 1, 0))
+
+
+def determineMaxDataFlow_bruteforce(bandwidth, streamCount):
+    """
+    Reference O(n^2 log n) solution that materialises and sorts every pair sum.
+
+    Only usable for small n; kept to cross-check determineMaxDataFlow in tests.
+    
+    The dataFlow for each data channel is defined as the sum of the bandwidth 
+    of its main and secondary nodes.
+    
+    Strategy:
+    - To maximize total dataFlow, we want to select pairs with the highest 
+      sum of bandwidths
+    - Each node can be used in multiple pairs (as different connections)
+    - We need to select streamCount unique pairs
+    - Pairs (x, y) and (y, x) are considered different connections
+    - A node can be paired with itself
+    
     Args:
         bandwidth (list): Array of bandwidth capability provided by each processing node
         streamCount (int): Number of data channels that needs to be connected
@@ -68,11 +214,34 @@ def determineMaxDataFlow(bandwidth, streamCount):
     return max_dataflow
 
 
-def main():
+def read_input(stream=None):
     """
-    Main function to read input and call the solution function.
-    Follows HackerRank input/output format.
+    Read a whole problem instance in one go.
+    
+    Reads all of stream (default: sys.stdin.buffer) as bytes and splits it on
+    whitespace, instead of calling input() once per line.
+    
+    Args:
+        stream: Binary file object holding the HackerRank input format
+        
+    Returns:
+        tuple: (bandwidth as array('q'), streamCount)
+        
+    Raises:
+        ValueError: If the input holds fewer than n + 2 integers
     """
+    tokens = (stream or sys.stdin.buffer).read().split()
+    if not tokens:
+        raise ValueError("empty input")
+    n = int(tokens[0])
+    if len(tokens) < n + 2:
+        raise ValueError(f"expected {n} bandwidth values and a streamCount")
+    bandwidth = array('q', map(int, tokens[1:n + 1]))
+    return bandwidth, int(tokens[n + 1])
+
+
+def read_input_by_line():
+    """Original reader: one input() call per line. Kept for the --bench comparison."""
     # Read number of nodes
     n = int(input().strip())
     
@@ -83,6 +252,53 @@ def main():
     
     # Read stream count
     streamCount = int(input().strip())
+    return bandwidth, streamCount
+
+
+def benchmark(n=200000, seed=0):
+    """Time parsing and solving separately on a generated max-size input."""
+    rng = random.Random(seed)
+    lines = [str(n), *(str(rng.randint(1, 200000)) for _ in range(n)), str(n * n // 2)]
+    data = ("\n".join(lines) + "\n").encode()
+    print(f"Input: n={n}, {len(data) / 2**20:.1f} MiB")
+    
+    stdin = sys.stdin
+    try:
+        sys.stdin = io.TextIOWrapper(io.BytesIO(data))
+        start = time.perf_counter()
+        expected = read_input_by_line()
+        by_line = time.perf_counter() - start
+    finally:
+        sys.stdin = stdin
+    start = time.perf_counter()
+    bandwidth, streamCount = read_input(io.BytesIO(data))
+    bulk = time.perf_counter() - start
+    assert (list(bandwidth), streamCount) == expected
+    
+    start = time.perf_counter()
+    result = determineMaxDataFlow(bandwidth, streamCount)
+    solve = time.perf_counter() - start
+    
+    print(f"  parse, input() per line: {by_line:.3f}s")
+    print(f"  parse, bulk read:        {bulk:.3f}s ({by_line / bulk:.1f}x)")
+    print(f"  solve:                   {solve:.3f}s (result {result})")
+    print(f"  total:                   {bulk + solve:.3f}s, parsing {bulk / (bulk + solve):.0%}")
+
+
+def main(argv=None):
+    """
+    Main function to read input and call the solution function.
+    Follows HackerRank input/output format.
+    
+    With --bench, generates a max-size input and reports parse and solve time
+    instead of reading stdin.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if "--bench" in argv:
+        benchmark()
+        return
+    
+    bandwidth, streamCount = read_input()
     
     # Calculate and print result
     result = determineMaxDataFlow(bandwidth, streamCount)
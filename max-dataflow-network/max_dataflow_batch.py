@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Batch evaluation of determineMaxDataFlow with NumPy.
+
+Planning runs score thousands of candidate node configurations at once.
+Calling determineMaxDataFlow per configuration spends most of its time in
+the Python-level loops. This module solves a whole 2-D array of bandwidth
+vectors (one configuration per row) with vectorised sort / searchsorted /
+cumsum, using the same threshold search as max_dataflow.py.
+
+Rows are split into chunks that run on a thread pool; NumPy releases the GIL
+inside sort and searchsorted, so chunks make progress in parallel.
+
+Requires numpy (max_dataflow.py itself does not).
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from max_dataflow import determineMaxDataFlow
+
+
+def determineMaxDataFlowBatch(bandwidths, streamCounts, workers=None, chunk_rows=256):
+    """
+    Determine the maximum total dataFlow for many configurations at once.
+
+    Args:
+        bandwidths (array-like): 2-D integer array, one row of n node bandwidths
+            per configuration
+        streamCounts (array-like): 1-D integer array with one streamCount per row
+        workers (int): Threads used for the row chunks (default: CPU count)
+        chunk_rows (int): Rows per chunk
+
+    Returns:
+        numpy.ndarray: int64 array with determineMaxDataFlow(row, count) per row
+
+    Raises:
+        ValueError: If the shapes of bandwidths and streamCounts do not match
+    """
+    bandwidths = np.asarray(bandwidths, dtype=np.int64)
+    streamCounts = np.asarray(streamCounts, dtype=np.int64)
+    if bandwidths.ndim != 2:
+        raise ValueError("bandwidths must be a 2-D array (one configuration per row)")
+    if streamCounts.shape != (bandwidths.shape[0],):
+        raise ValueError("streamCounts must have one entry per row of bandwidths")
+
+    rows = bandwidths.shape[0]
+    result = np.zeros(rows, dtype=np.int64)
+    if rows == 0 or bandwidths.shape[1] == 0:
+        return result
+
+    starts = range(0, rows, chunk_rows)
+
+    def solve(start):
+        stop = min(start + chunk_rows, rows)
+        result[start:stop] = _solve_chunk(bandwidths[start:stop], streamCounts[start:stop])
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(starts) == 1:
+        for start in starts:
+            solve(start)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(solve, starts))
+    return result
+
+
+def _solve_chunk(bandwidths, streamCounts):
+    """Threshold search for every row of one chunk; returns an int64 array."""
+    rows, n = bandwidths.shape
+    counts = np.minimum(streamCounts, n * n)
+    values = np.sort(bandwidths, axis=1)
+
+    # Lay the rows out in one sorted flat array: row r occupies the value band
+    # [r * stride, r * stride + span], so a single searchsorted answers
+    # "how many values in row r are < v" for every (row, v) query at once.
+    base = values.min()
+    span = int(values.max() - base)
+    stride = span + 2
+    row_ids = np.arange(rows, dtype=np.int64)[:, None]
+    row_offsets = row_ids * stride
+    flat = (values - base + row_offsets).ravel()
+    row_starts = row_ids * n
+
+    def positions(thresholds):
+        # for each x in the row, index of the first y with x + y >= threshold
+        query = np.clip(thresholds[:, None] - values - base, 0, span + 1) + row_offsets
+        return np.searchsorted(flat, query.ravel()).reshape(rows, n) - row_starts
+
+    low = 2 * values[:, 0]
+    high = 2 * values[:, -1]
+    while True:
+        active = low < high
+        if not active.any():
+            break
+        mid = (low + high + 1) // 2
+        enough = (n * n - positions(mid).sum(axis=1)) >= counts
+        low = np.where(active & enough, mid, low)
+        high = np.where(active & ~enough, mid - 1, high)
+    threshold = low
+
+    # Take every pair strictly above the threshold, then fill up with pairs equal to it
+    first = positions(threshold + 1)
+    prefix = np.zeros((rows, n + 1), dtype=np.int64)
+    np.cumsum(values, axis=1, out=prefix[:, 1:])
+    above_counts = n - first
+    above = (above_counts * values).sum(axis=1)
+    above += (prefix[:, -1:] - np.take_along_axis(prefix, first, axis=1)).sum(axis=1)
+    total = above + (counts - above_counts.sum(axis=1)) * threshold
+    return np.where(counts > 0, total, 0)
+
+
+def benchmark(configurations=2000, nodes=1000, workers=None, seed=0):
+    """Report configurations per second for the batch API against a scalar loop."""
+    rng = np.random.default_rng(seed)
+    bandwidths = rng.integers(1, 200001, size=(configurations, nodes), dtype=np.int64)
+    streamCounts = rng.integers(1, nodes * nodes + 1, size=configurations, dtype=np.int64)
+    print(f"{configurations} configurations of {nodes} nodes")
+
+    rows = bandwidths.tolist()
+    counts = streamCounts.tolist()
+    start = time.perf_counter()
+    expected = [determineMaxDataFlow(row, count) for row, count in zip(rows, counts)]
+    scalar = time.perf_counter() - start
+    print(f"  scalar loop: {scalar:7.2f}s  {configurations / scalar:10,.0f} configs/s")
+
+    for threads in sorted({1, workers or os.cpu_count() or 1}):
+        start = time.perf_counter()
+        result = determineMaxDataFlowBatch(bandwidths, streamCounts, workers=threads)
+        batch = time.perf_counter() - start
+        assert result.tolist() == expected
+        print(f"  batch, {threads} thread{'s' if threads > 1 else ' '}: {batch:7.2f}s  "
+              f"{configurations / batch:10,.0f} configs/s  ({scalar / batch:.1f}x)")
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Batch determineMaxDataFlow throughput")
+    parser.add_argument("--configurations", type=int, default=2000)
+    parser.add_argument("--nodes", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    benchmark(args.configurations, args.nodes, args.workers)
@@ -9,8 +9,12 @@ Tests cover:
 - Various data distributions
 """
 
+import io
+import random
+import time
 import unittest
-from max_dataflow import determineMaxDataFlow
+from itertools import islice
+from max_dataflow import determineMaxDataFlow, determineMaxDataFlow_bruteforce, iter_top_pairs, read_input
 
 
 class TestMaxDataFlow(unittest.TestCase):
@@ -190,6 +194,153 @@ class TestInputValidation(unittest.TestCase):
         self.assertEqual(result, 0)
 
 
+class TestAgainstBruteForce(unittest.TestCase):
+    """Cross-check the threshold search against the O(n^2 log n) reference"""
+    
+    def test_random_small_inputs(self):
+        """Random arrays with many duplicate sums and every streamCount"""
+        rng = random.Random(14)
+        for _ in range(300):
+            n = rng.randint(1, 12)
+            bandwidth = [rng.randint(1, 20) for _ in range(n)]
+            streamCount = rng.randint(1, n * n)
+            self.assertEqual(determineMaxDataFlow(bandwidth, streamCount),
+                             determineMaxDataFlow_bruteforce(bandwidth, streamCount),
+                             f"bandwidth={bandwidth}, streamCount={streamCount}")
+    
+    def test_wide_value_range(self):
+        """Values spread over the full constraint range"""
+        rng = random.Random(15)
+        for _ in range(5):
+            bandwidth = [rng.randint(1, 200000) for _ in range(60)]
+            for streamCount in (1, 59, 60, 61, 1800, 3600):
+                self.assertEqual(determineMaxDataFlow(bandwidth, streamCount),
+                                 determineMaxDataFlow_bruteforce(bandwidth, streamCount))
+
+
+class TestMaxConstraints(unittest.TestCase):
+    """Stress tests at n = 2 * 10^5, the documented upper limit"""
+    
+    N = 200000
+    
+    def _timed(self, bandwidth, streamCount):
+        start = time.perf_counter()
+        result = determineMaxDataFlow(bandwidth, streamCount)
+        elapsed = time.perf_counter() - start
+        print(f"\n  n={len(bandwidth)}, streamCount={streamCount}: {elapsed:.2f}s")
+        self.assertLess(elapsed, 10)
+        return result
+    
+    def test_all_pairs(self):
+        """streamCount = n^2 selects every pair: total is 2 * n * sum(bandwidth)"""
+        bandwidth = [random.Random(1).randint(1, 200000) for _ in range(self.N)]
+        result = self._timed(bandwidth, self.N * self.N)
+        self.assertEqual(result, 2 * self.N * sum(bandwidth))
+    
+    def test_single_stream(self):
+        """streamCount = 1 picks the largest node paired with itself"""
+        bandwidth = [random.Random(2).randint(1, 200000) for _ in range(self.N)]
+        result = self._timed(bandwidth, 1)
+        self.assertEqual(result, 2 * max(bandwidth))
+    
+    def test_uniform_maximum_values(self):
+        """All sums tie at the maximum value"""
+        bandwidth = [200000] * self.N
+        streamCount = self.N * self.N // 2
+        self.assertEqual(self._timed(bandwidth, streamCount), streamCount * 400000)
+    
+    def test_mid_range_streamcount(self):
+        """Threshold falls inside a dense band of sums"""
+        rng = random.Random(3)
+        bandwidth = [rng.randint(1, 200000) for _ in range(self.N)]
+        result = self._timed(bandwidth, 10 ** 9)
+        # bounded by the largest and smallest possible selections
+        self.assertLessEqual(result, 10 ** 9 * 2 * max(bandwidth))
+        self.assertGreaterEqual(result, 10 ** 9 * 2 * min(bandwidth))
+    
+    def test_two_values(self):
+        """Only three distinct sums; threshold lands on the middle one"""
+        bandwidth = [1] * (self.N // 2) + [200000] * (self.N // 2)
+        half = self.N // 2
+        streamCount = half * half + 5
+        expected = half * half * 400000 + 5 * 200001
+        self.assertEqual(self._timed(bandwidth, streamCount), expected)
+
+
+class TestTopPairs(unittest.TestCase):
+    """Test cases for the lazy iter_top_pairs generator"""
+    
+    def test_sample_case_0(self):
+        """First six pairs of Sample Case 0 add up to 86"""
+        bandwidth = [5, 4, 8, 4, 7]
+        pairs = list(islice(iter_top_pairs(bandwidth), 6))
+        self.assertEqual([flow for _, _, flow in pairs], [16, 15, 15, 14, 13, 13])
+        self.assertEqual(pairs[0][:2], (2, 2))
+        self.assertEqual(sum(flow for _, _, flow in pairs), 86)
+    
+    def test_every_pair_once_in_order(self):
+        """Exhausting the generator yields all n^2 pairs, descending"""
+        rng = random.Random(16)
+        for _ in range(200):
+            bandwidth = [rng.randint(1, 20) for _ in range(rng.randint(1, 10))]
+            pairs = list(iter_top_pairs(bandwidth))
+            n = len(bandwidth)
+            self.assertEqual(sorted((i, j) for i, j, _ in pairs),
+                             [(i, j) for i in range(n) for j in range(n)])
+            for i, j, flow in pairs:
+                self.assertEqual(flow, bandwidth[i] + bandwidth[j])
+            flows = [flow for _, _, flow in pairs]
+            self.assertEqual(flows, sorted(flows, reverse=True))
+    
+    def test_empty_bandwidth_array(self):
+        """No nodes, no pairs"""
+        self.assertEqual(list(iter_top_pairs([])), [])
+    
+    def test_prefix_matches_scalar_total(self):
+        """Benchmark: first k items at n = 2 * 10^5 agree with determineMaxDataFlow"""
+        rng = random.Random(17)
+        bandwidth = [rng.randint(1, 200000) for _ in range(200000)]
+        for k in (1000, 100000, 1000000):
+            start = time.perf_counter()
+            total = sum(flow for _, _, flow in islice(iter_top_pairs(bandwidth), k))
+            elapsed = time.perf_counter() - start
+            print(f"\n  iter_top_pairs n={len(bandwidth)}, k={k}: {elapsed:.2f}s "
+                  f"({k / elapsed:,.0f} pairs/s)")
+            self.assertEqual(total, determineMaxDataFlow(bandwidth, k))
+
+
+class TestReadInput(unittest.TestCase):
+    """Test cases for the bulk stdin reader"""
+    
+    def test_sample_input(self):
+        """HackerRank input format, one value per line"""
+        bandwidth, streamCount = read_input(io.BytesIO(b"5\n5\n4\n8\n4\n7\n6\n"))
+        self.assertEqual(list(bandwidth), [5, 4, 8, 4, 7])
+        self.assertEqual(streamCount, 6)
+        self.assertEqual(determineMaxDataFlow(bandwidth, streamCount), 86)
+    
+    def test_whitespace_and_crlf(self):
+        """Windows line endings, blank lines and trailing spaces are tolerated"""
+        bandwidth, streamCount = read_input(io.BytesIO(b"3\r\n 1 \r\n\r\n2\r\n3\r\n4"))
+        self.assertEqual((list(bandwidth), streamCount), ([1, 2, 3], 4))
+    
+    def test_truncated_input(self):
+        """Missing values raise ValueError"""
+        with self.assertRaises(ValueError):
+            read_input(io.BytesIO(b"3\n1\n2\n"))
+        with self.assertRaises(ValueError):
+            read_input(io.BytesIO(b""))
+    
+    def test_max_size_parse_time(self):
+        """Parsing 2 * 10^5 lines in bulk"""
+        data = ("200000\n" + "200000\n" * 200000 + "7\n").encode()
+        start = time.perf_counter()
+        bandwidth, streamCount = read_input(io.BytesIO(data))
+        elapsed = time.perf_counter() - start
+        print(f"\n  read_input n=200000: {elapsed:.3f}s")
+        self.assertEqual((len(bandwidth), streamCount), (200000, 7))
+
+
 def run_tests():
     """Run all tests and display results"""
     # Create test suite
@@ -199,6 +350,10 @@ def run_tests():
     # Add all test cases
     suite.addTests(loader.loadTestsFromTestCase(TestMaxDataFlow))
     suite.addTests(loader.loadTestsFromTestCase(TestInputValidation))
+    suite.addTests(loader.loadTestsFromTestCase(TestAgainstBruteForce))
+    suite.addTests(loader.loadTestsFromTestCase(TestMaxConstraints))
+    suite.addTests(loader.loadTestsFromTestCase(TestTopPairs))
+    suite.addTests(loader.loadTestsFromTestCase(TestReadInput))
     
     # Run tests with verbose output
     runner = unittest.TextTestRunner(verbosity=2)
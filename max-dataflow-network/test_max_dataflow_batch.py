@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the NumPy batch API in max_dataflow_batch.py
+
+Tests cover:
+- Agreement with the scalar determineMaxDataFlow row by row
+- Chunking and thread-pool paths
+- Shape validation
+- Throughput against the scalar loop
+"""
+
+import time
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; max_dataflow.py does not need it
+    np = None
+
+from max_dataflow import determineMaxDataFlow, determineMaxDataFlow_bruteforce
+
+if np is not None:
+    from max_dataflow_batch import determineMaxDataFlowBatch
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestMaxDataFlowBatch(unittest.TestCase):
+    """Test cases for determineMaxDataFlowBatch"""
+
+    def test_sample_cases(self):
+        """Both HackerRank samples padded into one batch of equal-length rows"""
+        bandwidths = [[5, 4, 8, 4, 7], [14, 128, 8, 14, 1]]
+        result = determineMaxDataFlowBatch(bandwidths, [6, 4])
+        self.assertEqual(result.tolist(), [86, determineMaxDataFlow([14, 128, 8, 14, 1], 4)])
+
+    def test_matches_bruteforce(self):
+        """Random small rows, including streamCount 0 and above n^2"""
+        rng = np.random.default_rng(16)
+        for n in (1, 2, 5, 9):
+            for high in (1, 4, 50, 200000):
+                bandwidths = rng.integers(1, high + 1, size=(200, n))
+                streamCounts = rng.integers(0, n * n + 3, size=200)
+                expected = [determineMaxDataFlow_bruteforce(row, int(count))
+                            for row, count in zip(bandwidths.tolist(), streamCounts)]
+                result = determineMaxDataFlowBatch(bandwidths, streamCounts, workers=3, chunk_rows=17)
+                self.assertEqual(result.tolist(), expected, f"n={n}, high={high}")
+
+    def test_chunking_does_not_change_results(self):
+        """Single chunk, many chunks and a thread pool agree"""
+        rng = np.random.default_rng(17)
+        bandwidths = rng.integers(1, 1000, size=(500, 40))
+        streamCounts = rng.integers(1, 1601, size=500)
+        reference = determineMaxDataFlowBatch(bandwidths, streamCounts, workers=1, chunk_rows=500)
+        for workers, chunk_rows in ((1, 7), (4, 64), (8, 1)):
+            result = determineMaxDataFlowBatch(bandwidths, streamCounts, workers=workers, chunk_rows=chunk_rows)
+            self.assertTrue(np.array_equal(result, reference))
+
+    def test_max_constraint_values(self):
+        """Large sums stay exact in int64"""
+        n = 20000
+        bandwidths = np.full((2, n), 200000)
+        streamCounts = [n * n, 1]
+        result = determineMaxDataFlowBatch(bandwidths, streamCounts)
+        self.assertEqual(result.tolist(), [n * n * 400000, 400000])
+
+    def test_empty_batch(self):
+        """No rows gives an empty result"""
+        result = determineMaxDataFlowBatch(np.zeros((0, 5), dtype=np.int64), [])
+        self.assertEqual(result.tolist(), [])
+
+    def test_shape_validation(self):
+        """Mismatched shapes are rejected"""
+        with self.assertRaises(ValueError):
+            determineMaxDataFlowBatch([1, 2, 3], [1])
+        with self.assertRaises(ValueError):
+            determineMaxDataFlowBatch([[1, 2], [3, 4]], [1])
+
+    def test_throughput_against_scalar_loop(self):
+        """Benchmark: configurations per second, batch vs scalar"""
+        rng = np.random.default_rng(18)
+        bandwidths = rng.integers(1, 200001, size=(200, 1000))
+        streamCounts = rng.integers(1, 1000 * 1000 + 1, size=200)
+
+        start = time.perf_counter()
+        expected = [determineMaxDataFlow(row, count)
+                    for row, count in zip(bandwidths.tolist(), streamCounts.tolist())]
+        scalar = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = determineMaxDataFlowBatch(bandwidths, streamCounts)
+        batch = time.perf_counter() - start
+
+        print(f"\n  200 x 1000 nodes: scalar {200 / scalar:,.0f} configs/s, "
+              f"batch {200 / batch:,.0f} configs/s ({scalar / batch:.1f}x)")
+        self.assertEqual(result.tolist(), expected)
+
+
+def run_tests():
+    """Run all tests and display results"""
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestMaxDataFlowBatch)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    exit(run_tests())
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AutocompleteSystem.py
+
+Every backend is compared with a model that sorts all matching words on
+every query (ties broken by word):
+- The freq_map and cached trie modes
+- RadixAutocompleteSystem, also through create_autocomplete
+- bulk_load, and save_snapshot / load_snapshot round trips from every backend
+- input_fuzzy against a Levenshtein distance over every prefix of every word
+- ConcurrentAutocompleteSystem: updates become visible a whole batch at a time
+- Time decay, with an injected clock
+"""
+
+import os
+import random
+import tempfile
+import threading
+import unittest
+
+from AutocompleteSystem import (AutocompleteSystem, ConcurrentAutocompleteSystem, RadixAutocompleteSystem,
+                                create_autocomplete, load_snapshot, save_snapshot)
+
+LETTERS = "abc"
+
+
+class Model:
+    """Brute-force reference: word -> frequency, sorted on every query."""
+
+    def __init__(self, k):
+        self.k = k
+        self.freqs = {}
+
+    def add_word(self, word, freq=1):
+        self.freqs[word] = self.freqs.get(word, 0) + freq
+
+    def input(self, prefix):
+        if not prefix:
+            return []
+        matches = sorted((-freq, word) for word, freq in self.freqs.items() if word.startswith(prefix))
+        return [word for _, word in matches[:self.k]]
+
+
+def random_word(rng, max_length=5):
+    """Short words over a small alphabet, so prefixes are widely shared."""
+    return "".join(rng.choice(LETTERS) for _ in range(rng.randint(1, max_length)))
+
+
+def all_prefixes(max_length=4):
+    prefixes = [""]
+    for length in range(1, max_length + 1):
+        prefixes += [p + char for p in prefixes if len(p) == length - 1 for char in LETTERS]
+    return prefixes + ["d", "abd"]
+
+
+class AutocompleteTestCase(unittest.TestCase):
+    def assertMatchesModel(self, system, model, message=None):
+        for prefix in all_prefixes():
+            self.assertEqual(system.input(prefix), model.input(prefix), f"{message}, prefix={prefix!r}")
+
+
+class TestAutocompleteSystem(AutocompleteTestCase):
+    """Test cases for AutocompleteSystem in freq_map and cached mode"""
+
+    def test_example(self):
+        """The example from AutocompleteSystem.py's __main__"""
+        for cached in (False, True):
+            auto = AutocompleteSystem(k=3, cached=cached, verbose=False)
+            for word, freq in [("dog", 5), ("dove", 3), ("door", 7), ("dodge", 2), ("cat", 6)]:
+                auto.add_word(word, freq)
+            self.assertEqual(auto.input("do"), ["door", "dog", "dove"])
+            self.assertEqual(auto.input("c"), ["cat"])
+            self.assertEqual(auto.input("z"), [])
+            auto.add_word("dodge", 6)
+            self.assertEqual(auto.input("d"), ["dodge", "door", "dog"])
+
+    def test_against_model(self):
+        """Random inserts and repeated updates, including zero-frequency ones"""
+        for seed in range(20):
+            rng = random.Random(seed)
+            k = rng.randint(1, 4)
+            for cached in (False, True):
+                auto = AutocompleteSystem(k=k, cached=cached, verbose=False)
+                model = Model(k)
+                for step in range(150):
+                    word, freq = random_word(rng), rng.randint(0, 5)
+                    auto.add_word(word, freq)
+                    model.add_word(word, freq)
+                    if step % 10 == 0:
+                        self.assertMatchesModel(auto, model, f"seed={seed}, cached={cached}, step={step}")
+                self.assertMatchesModel(auto, model, f"seed={seed}, cached={cached}")
+                self.assertEqual(dict(auto.items()), model.freqs)
+                for word, freq in model.freqs.items():
+                    self.assertEqual(auto.frequency(word), freq)
+                self.assertEqual(auto.frequency("zzz"), 0)
+
+    def test_negative_frequency(self):
+        """Cached mode rejects negative updates and leaves the rankings alone"""
+        auto = AutocompleteSystem(k=2, cached=True, verbose=False)
+        auto.add_word("ab", 3)
+        auto.add_word("ac", 2)
+        with self.assertRaises(ValueError):
+            auto.add_word("ab", -2)
+        self.assertEqual(auto.input("a"), ["ab", "ac"])
+        self.assertEqual(auto.frequency("ab"), 3)
+
+
+class TestRadixAutocompleteSystem(AutocompleteTestCase):
+    """Test cases for RadixAutocompleteSystem"""
+
+    def test_against_model(self):
+        """Random inserts that split, extend and end on existing edges"""
+        for seed in range(20):
+            rng = random.Random(seed)
+            k = rng.randint(1, 4)
+            auto = create_autocomplete("radix", k=k, verbose=False)
+            self.assertIsInstance(auto, RadixAutocompleteSystem)
+            model = Model(k)
+            for step in range(150):
+                word, freq = random_word(rng, max_length=7), rng.randint(0, 5)
+                auto.add_word(word, freq)
+                model.add_word(word, freq)
+                if step % 10 == 0:
+                    self.assertMatchesModel(auto, model, f"seed={seed}, step={step}")
+            self.assertMatchesModel(auto, model, f"seed={seed}")
+            self.assertEqual(dict(auto.items()), model.freqs)
+
+    def test_negative_frequency(self):
+        auto = RadixAutocompleteSystem(k=2, verbose=False)
+        auto.add_word("ab", 3)
+        with self.assertRaises(ValueError):
+            auto.add_word("ab", -1)
+        self.assertEqual(dict(auto.items()), {"ab": 3})
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            create_autocomplete("dawg")
+
+
+def random_corpus(rng, size=120):
+    """(word, freq) pairs with repeated words, as bulk_load accepts them."""
+    return [(random_word(rng, max_length=6), rng.randint(0, 9)) for _ in range(size)]
+
+
+class TestSnapshots(AutocompleteTestCase):
+    """Test cases for bulk_load, save_snapshot and load_snapshot"""
+
+    BACKENDS = {
+        "trie (freq_map)": lambda k: AutocompleteSystem(k=k, verbose=False),
+        "trie (cached)": lambda k: AutocompleteSystem(k=k, cached=True, verbose=False),
+        "radix": lambda k: RadixAutocompleteSystem(k=k, verbose=False),
+    }
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "words.acsnap")
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        os.rmdir(self.directory)
+
+    def test_bulk_load(self):
+        """bulk_load into an empty or a populated system equals adding every pair"""
+        for seed in range(10):
+            rng = random.Random(seed)
+            k = rng.randint(1, 4)
+            for name, factory in self.BACKENDS.items():
+                auto, model = factory(k), Model(k)
+                for word, freq in random_corpus(rng, size=rng.randint(0, 30)):
+                    auto.add_word(word, freq)
+                    model.add_word(word, freq)
+                corpus = random_corpus(rng)
+                auto.bulk_load(corpus)
+                for word, freq in corpus:
+                    model.add_word(word, freq)
+                self.assertMatchesModel(auto, model, f"seed={seed}, {name}")
+
+    def test_round_trip(self):
+        """A loaded snapshot answers like the system it was saved from"""
+        for seed in range(10):
+            rng = random.Random(seed)
+            k = rng.randint(1, 4)
+            corpus = random_corpus(rng)
+            model = Model(k)
+            for word, freq in corpus:
+                model.add_word(word, freq)
+            for name, factory in self.BACKENDS.items():
+                auto = factory(k)
+                auto.bulk_load(corpus)
+                save_snapshot(auto, self.path)
+                with load_snapshot(self.path) as snapshot:
+                    self.assertEqual(snapshot.k, k)
+                    self.assertEqual(len(snapshot), len(model.freqs))
+                    self.assertEqual(dict(snapshot.items()), model.freqs)
+                    self.assertMatchesModel(snapshot, model, f"seed={seed}, {name}")
+
+    def test_multibyte_words(self):
+        """Snapshots match on UTF-8 bytes, so a prefix may end inside a shared character"""
+        auto = RadixAutocompleteSystem(k=3, verbose=False)
+        auto.bulk_load([("café", 5), ("cafe", 4), ("caffè", 3), ("ça", 2)])
+        save_snapshot(auto, self.path)
+        with load_snapshot(self.path) as snapshot:
+            for prefix in ("caf", "café", "caff", "ç", "c", "e"):
+                self.assertEqual(snapshot.input(prefix), auto.input(prefix), prefix)
+
+    def test_not_a_snapshot(self):
+        with open(self.path, "wb") as f:
+            f.write(b"\0" * 64)
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+
+
+def levenshtein(a, b):
+    row = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        previous, row[0] = row[0], i
+        for j in range(1, len(b) + 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (char != b[j - 1]))
+    return row[-1]
+
+
+def fuzzy_model(model, query, max_dist):
+    """Words with some prefix (possibly empty or the whole word) within max_dist edits of query."""
+    matches = sorted((-freq, word) for word, freq in model.freqs.items()
+                     if min(levenshtein(query, word[:i]) for i in range(len(word) + 1)) <= max_dist)
+    return [word for _, word in matches[:model.k]]
+
+
+class TestFuzzy(unittest.TestCase):
+    """Test cases for input_fuzzy"""
+
+    def test_against_brute_force(self):
+        """Random queries with up to two edits, including letters no word contains"""
+        for seed in range(10):
+            rng = random.Random(seed)
+            k = rng.randint(1, 4)
+            corpus = random_corpus(rng, size=60)
+            model = Model(k)
+            for word, freq in corpus:
+                model.add_word(word, freq)
+            for name, factory in TestSnapshots.BACKENDS.items():
+                auto = factory(k)
+                auto.bulk_load(corpus)
+                for _ in range(25):
+                    query = "".join(rng.choice(LETTERS + "d") for _ in range(rng.randint(1, 6)))
+                    for max_dist in (0, 1, 2):
+                        self.assertEqual(auto.input_fuzzy(query, max_dist), fuzzy_model(model, query, max_dist),
+                                         f"seed={seed}, {name}, query={query!r}, max_dist={max_dist}")
+
+    def test_empty_prefix(self):
+        """An empty prefix suggests nothing, as with input("")"""
+        for name, factory in TestSnapshots.BACKENDS.items():
+            auto = factory(3)
+            auto.bulk_load([("a", 1), ("bc", 2)])
+            for max_dist in (0, 1, 2):
+                self.assertEqual(auto.input_fuzzy("", max_dist), [], name)
+
+    def test_updates_after_queries(self):
+        """freq_map mode re-ranks subtrees whose cached lists went stale"""
+        auto = AutocompleteSystem(k=2, verbose=False)
+        auto.bulk_load([("abc", 3), ("abd", 2), ("bbc", 1)])
+        self.assertEqual(auto.input_fuzzy("xbc", 1), ["abc", "bbc"])
+        auto.add_word("bbc", 5)
+        self.assertEqual(auto.input_fuzzy("xbc", 1), ["bbc", "abc"])
+
+
+class TestConcurrentAutocompleteSystem(AutocompleteTestCase):
+    """Test cases for ConcurrentAutocompleteSystem"""
+
+    def test_batches(self):
+        """Queued updates stay invisible until batch_size distinct words or flush() publish them"""
+        for seed in range(10):
+            rng = random.Random(seed)
+            k, batch_size = rng.randint(1, 4), rng.randint(1, 8)
+            auto = create_autocomplete("concurrent", k=k, batch_size=batch_size)
+            published, model = Model(k), Model(k)
+            pending = set()
+            for step in range(200):
+                word, freq = random_word(rng), rng.randint(0, 5)
+                auto.add_word(word, freq)
+                model.add_word(word, freq)
+                pending.add(word)
+                if len(pending) >= batch_size:
+                    published.freqs = dict(model.freqs)
+                    pending.clear()
+                if step % 10 == 0:
+                    self.assertMatchesModel(auto, published, f"seed={seed}, step={step}")
+                if rng.random() < 0.05:
+                    version = auto.version
+                    auto.flush()
+                    self.assertEqual(auto.version, version + bool(pending))
+                    published.freqs = dict(model.freqs)
+                    pending.clear()
+            auto.flush()
+            self.assertMatchesModel(auto, model, f"seed={seed}")
+            self.assertEqual(dict(auto.items()), {word: freq for word, freq in model.freqs.items() if freq > 0})
+
+    def test_fuzzy(self):
+        """input_fuzzy answers like the other backends from the published version"""
+        for seed in range(5):
+            rng = random.Random(seed)
+            corpus = random_corpus(rng, size=60)
+            model = Model(3)
+            for word, freq in corpus:
+                model.add_word(word, freq)
+            auto = ConcurrentAutocompleteSystem(k=3)
+            auto.bulk_load(corpus)
+            auto.add_word("cab", 100)  # queued, not published
+            for _ in range(20):
+                query = "".join(rng.choice(LETTERS) for _ in range(rng.randint(1, 5)))
+                for max_dist in (0, 1, 2):
+                    self.assertEqual(auto.input_fuzzy(query, max_dist), fuzzy_model(model, query, max_dist),
+                                     f"seed={seed}, query={query!r}, max_dist={max_dist}")
+        self.assertEqual(auto.input_fuzzy("", 1), [])
+
+    def test_negative_frequency(self):
+        """Negative updates are rejected without queueing or publishing anything"""
+        auto = ConcurrentAutocompleteSystem(k=2, batch_size=10)
+        auto.add_word("ab", 3)
+        with self.assertRaises(ValueError):
+            auto.add_word("ab", -1)
+        with self.assertRaises(ValueError):
+            auto.bulk_load([("ac", 2), ("ab", -1)])
+        self.assertEqual(auto.version, 0)
+        auto.flush()
+        self.assertEqual(dict(auto.items()), {"ab": 3})
+
+    def test_readers_see_whole_batches(self):
+        """Every batch raises two words together, so no reader may see them differ"""
+        auto = ConcurrentAutocompleteSystem(k=2, batch_size=2)
+        stop = threading.Event()
+        torn = []
+
+        def read():
+            while not stop.is_set():
+                freqs = dict(auto.items())
+                if freqs.get("ab") != freqs.get("ac"):
+                    torn.append(freqs)
+
+        readers = [threading.Thread(target=read) for _ in range(2)]
+        for reader in readers:
+            reader.start()
+        try:
+            for _ in range(300):
+                auto.add_word("ab")
+                auto.add_word("ac")  # second distinct word publishes the batch
+        finally:
+            stop.set()
+            for reader in readers:
+                reader.join()
+        self.assertEqual(torn, [])
+        self.assertEqual((auto.version, dict(auto.items())), (300, {"ab": 300, "ac": 300}))
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestDecay(AutocompleteTestCase):
+    """Test cases for half_life decay"""
+
+    def test_against_model(self):
+        """Rankings and decayed frequencies follow the sum of halved hits"""
+        half_life = 10.0
+        for seed in range(10):
+            rng = random.Random(seed)
+            for cached in (False, True):
+                clock = FakeClock(rng.uniform(0, 100))
+                auto = AutocompleteSystem(k=3, cached=cached, verbose=False, half_life=half_life, clock=clock)
+                hits = []  # (word, freq, time)
+                for _ in range(100):
+                    clock.now += rng.uniform(0, 5)
+                    word, freq = random_word(rng, max_length=4), rng.uniform(0.5, 5)
+                    if rng.random() < 0.2:
+                        timestamp = clock.now - rng.uniform(0, 20)  # a late-arriving hit
+                        auto.add_word(word, freq, timestamp)
+                    else:
+                        timestamp = clock.now
+                        auto.add_word(word, freq)
+                    hits.append((word, freq, timestamp))
+                model = Model(3)
+                for word, freq, timestamp in hits:
+                    model.add_word(word, freq * 2 ** (-(clock.now - timestamp) / half_life))
+                self.assertMatchesModel(auto, model, f"seed={seed}, cached={cached}")
+                clock.now += 25  # decay divides every score alike, so the order holds
+                self.assertMatchesModel(auto, model, f"seed={seed}, cached={cached}, later")
+                decayed = dict(auto.items())
+                self.assertEqual(set(decayed), set(model.freqs))
+                for word, freq in model.freqs.items():
+                    expected = freq * 2 ** (-25 / half_life)
+                    self.assertAlmostEqual(decayed[word] / expected, 1, places=9)
+                    self.assertAlmostEqual(auto.frequency(word, now=clock.now - 25) / freq, 1, places=9)
+
+    def test_stale_word_drops_out(self):
+        clock = FakeClock()
+        auto = AutocompleteSystem(k=1, cached=True, verbose=False, half_life=10, clock=clock)
+        auto.add_word("xa", 8)
+        clock.now = 20
+        auto.add_word("xb", 3)  # xa is worth 2 by now
+        self.assertEqual(auto.input("x"), ["xb"])
+        self.assertAlmostEqual(auto.frequency("xa"), 2)
+        auto.bulk_load([("xa", 1.5)])
+        self.assertEqual(auto.input("x"), ["xa"])
+        self.assertAlmostEqual(auto.frequency("xa", now=30), 1.75)
+
+    def test_non_positive_weight(self):
+        for cached in (False, True):
+            auto = AutocompleteSystem(cached=cached, verbose=False, half_life=10, clock=FakeClock())
+            with self.assertRaises(ValueError):
+                auto.add_word("a", 0)
+
+
+def run_tests():
+    """Run all tests and display results"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    for case in (TestAutocompleteSystem, TestRadixAutocompleteSystem, TestSnapshots, TestFuzzy,
+                 TestConcurrentAutocompleteSystem, TestDecay):
+        suite.addTests(loader.loadTestsFromTestCase(case))
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    exit(run_tests())
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Unit tests for LibrarySystem.py
+
+Tests cover:
+- IndexedLibrarySystem against a brute-force model
+- DurableLibrarySystem recovery: reopen, checkpoint, torn log records,
+  the last-record fold and the bulk rebuild of long log tails
+- ShardedLibrarySystem against the same model
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from LibrarySystem import (DurableLibrarySystem, IndexedLibrarySystem, ShardedLibrarySystem,
+                           WAL_RECORD)
+
+
+class Model:
+    """Brute-force reference: sorts everything on every query."""
+
+    def __init__(self, entries):
+        self.price = {(branch, book): price for branch, book, price in entries}
+        self.rented = set()
+
+    def search(self, bookId):
+        copies = sorted((price, branch) for (branch, book), price in self.price.items()
+                        if book == bookId and (branch, book) not in self.rented)
+        return [branch for _, branch in copies[:5]]
+
+    def rent(self, branch, book):
+        self.rented.add((branch, book))
+
+    def drop(self, branch, book):
+        self.rented.remove((branch, book))
+
+    def report(self):
+        rented = sorted((self.price[copy], copy[0], copy[1]) for copy in self.rented)
+        return [[branch, book] for _, branch, book in rented[:5]]
+
+
+def random_entries(rng, branches=8, books=12, prices=20):
+    return [[branch, book, rng.randint(1, prices)]
+            for branch in range(branches) for book in range(books) if rng.random() < 0.6]
+
+
+def random_operation(rng, model):
+    """A valid ("rent" | "drop", [(branch, book), ...]) batch for the model's current state."""
+    available = sorted(set(model.price) - model.rented)
+    rented = sorted(model.rented)
+    if rented and (not available or rng.random() < 0.45):
+        return "drop", rng.sample(rented, rng.randint(1, min(3, len(rented))))
+    return "rent", rng.sample(available, rng.randint(1, min(3, len(available))))
+
+
+class LibraryTestCase(unittest.TestCase):
+    def apply(self, system, model, rng, batched=True):
+        operation, pairs = random_operation(rng, model)
+        for branch, book in pairs:
+            getattr(model, operation)(branch, book)
+        if batched and len(pairs) > 1:
+            getattr(system, operation + "_many")(pairs)
+        else:
+            for branch, book in pairs:
+                getattr(system, operation)(branch, book)
+
+    def assertSameState(self, system, model, message=None):
+        self.assertEqual(system.report(), model.report(), message)
+        for book in {book for _, book in model.price} | {-1}:
+            self.assertEqual(system.search(book), model.search(book), message)
+
+
+class TestIndexedLibrarySystem(LibraryTestCase):
+    """Test cases for IndexedLibrarySystem"""
+
+    def test_example(self):
+        """The example from LibrarySystem.py's __main__"""
+        system = IndexedLibrarySystem([[1, 101, 5], [2, 101, 4], [3, 102, 7], [1, 103, 6], [2, 104, 2]])
+        self.assertEqual(system.search(101), [2, 1])
+        system.rent(2, 101)
+        self.assertEqual(system.report(), [[2, 101]])
+        self.assertEqual(system.search(101), [1])
+        system.drop(2, 101)
+        self.assertEqual(system.report(), [])
+        self.assertEqual(system.search(101), [2, 1])
+
+    def test_against_model(self):
+        """Random rents and drops, including re-renting dropped copies"""
+        for seed in range(30):
+            rng = random.Random(seed)
+            entries = random_entries(rng)
+            system, model = IndexedLibrarySystem(entries), Model(entries)
+            for _ in range(200):
+                self.apply(system, model, rng, batched=False)
+                self.assertSameState(system, model, f"seed={seed}")
+
+    def test_invalid_operations(self):
+        """Renting a rented copy or dropping an available one raises KeyError"""
+        system = IndexedLibrarySystem([[1, 101, 5]])
+        with self.assertRaises(KeyError):
+            system.drop(1, 101)
+        system.rent(1, 101)
+        with self.assertRaises(KeyError) as raised:
+            system.rent(1, 101)
+        self.assertEqual(raised.exception.args, ((1, 101),))
+        # the failed rent of the only copy leaves no empty heap behind
+        self.assertNotIn(101, system.available_books)
+        with self.assertRaises(KeyError) as raised:
+            system.rent(9, 101)
+        self.assertEqual(raised.exception.args, ((9, 101),))
+
+
+class TestDurableLibrarySystem(LibraryTestCase):
+    """Test cases for DurableLibrarySystem"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def open(self, entries=None, **kwargs):
+        kwargs.setdefault("sync", False)
+        return DurableLibrarySystem(self.directory, entries, **kwargs)
+
+    def wal_files(self):
+        return sorted(name for name in os.listdir(self.directory) if name.startswith("wal-"))
+
+    def test_missing_snapshot(self):
+        """Opening an empty directory without entries fails"""
+        with self.assertRaises(FileNotFoundError):
+            self.open()
+
+    def test_reopen_against_model(self):
+        """Random operations with frequent checkpoints and reopens"""
+        for seed in range(10):
+            rng = random.Random(seed)
+            entries = random_entries(rng)
+            model = Model(entries)
+            shutil.rmtree(self.directory)
+            system = self.open(entries, checkpoint_every=rng.randint(3, 40))
+            for step in range(300):
+                self.apply(system, model, rng)
+                if rng.random() < 0.05:
+                    system.close()
+                    system = self.open(checkpoint_every=system.checkpoint_every)
+                    self.assertSameState(system, model, f"seed={seed}, step={step}")
+            system.close()
+            with self.open() as system:
+                self.assertSameState(system, model, f"seed={seed}")
+
+    def test_checkpoint(self):
+        """checkpoint starts a new log generation and removes the old log"""
+        rng = random.Random(1)
+        entries = random_entries(rng)
+        model = Model(entries)
+        system = self.open(entries)
+        generation = system.generation
+        for _ in range(20):
+            self.apply(system, model, rng)
+        system.checkpoint()
+        self.assertEqual(system.generation, generation + 1)
+        self.assertEqual(self.wal_files(), [f"wal-{generation + 1}.log"])
+        self.assertEqual(os.path.getsize(os.path.join(self.directory, self.wal_files()[0])), 0)
+        for _ in range(20):
+            self.apply(system, model, rng)
+        system.close()
+
+        stats = {}
+        with self.open(stats=stats) as system:
+            self.assertEqual(system.generation, generation + 1)
+            self.assertGreater(stats['replayed'], 0)
+            self.assertSameState(system, model)
+
+    def test_torn_record(self):
+        """A partial record at the end of the log is dropped and truncated away"""
+        rng = random.Random(2)
+        entries = random_entries(rng)
+        model = Model(entries)
+        system = self.open(entries)
+        for _ in range(30):
+            self.apply(system, model, rng)
+        system.close()
+
+        path = os.path.join(self.directory, self.wal_files()[0])
+        size = os.path.getsize(path)
+        available = sorted(set(model.price) - model.rented)
+        with open(path, 'ab') as f:
+            # a rent that crashed halfway through its write was never acknowledged
+            f.write(WAL_RECORD.pack(1, *available[0])[:WAL_RECORD.size - 3])
+
+        system = self.open()
+        self.assertEqual(os.path.getsize(path), size)
+        self.assertSameState(system, model)
+        for _ in range(30):
+            self.apply(system, model, rng)
+        system.close()
+        with self.open() as system:
+            self.assertSameState(system, model)
+
+    def test_fold_to_last_record(self):
+        """Replaying many flips of the same copies applies only their final state"""
+        entries = [[branch, book, (branch * 7 + book) % 5] for branch in range(4) for book in range(3)]
+        model = Model(entries)
+        system = self.open(entries)
+        for round_ in range(25):
+            for branch, book, _ in entries[:6]:
+                system.rent(branch, book)
+                system.drop(branch, book)
+            if round_ % 2:
+                system.rent(0, 1)
+                system.drop(0, 1)
+        system.rent_many([(1, 2), (3, 0)])
+        model.rent(1, 2)
+        model.rent(3, 0)
+        system.close()
+
+        stats = {}
+        with self.open(stats=stats) as system:
+            self.assertEqual(stats['replayed'], 25 * 12 + 12 * 2 + 2)
+            self.assertSameState(system, model)
+
+    def test_long_tail_rebuild(self):
+        """A log tail large enough to take the bulk rebuild path in _apply_net"""
+        rng = random.Random(3)
+        entries = [[branch, book, rng.randint(1, 1000)] for branch in range(60) for book in range(50)]
+        model = Model(entries)
+        system = self.open(entries, checkpoint_every=10**9)
+        copies = [(branch, book) for branch, book, _ in entries]
+        rng.shuffle(copies)
+        system.rent_many(copies[:2500])
+        system.checkpoint()
+        # the tail then drops 1200 rented copies and rents 300 more
+        system.drop_many(copies[:1200])
+        system.rent_many(copies[2500:2800])
+        for copy in copies[1200:2800]:
+            model.rent(*copy)
+        system.close()
+
+        with self.open() as system:
+            self.assertSameState(system, model)
+            system.drop_many(copies[2700:2800])
+            for copy in copies[2700:2800]:
+                model.drop(*copy)
+            self.assertSameState(system, model)
+
+    def test_failed_batch_logs_applied_prefix(self):
+        """If a pair in rent_many fails, the pairs before it stay applied after a reopen"""
+        entries = [[1, 101, 5], [2, 101, 4], [3, 102, 7]]
+        model = Model(entries)
+        system = self.open(entries)
+        with self.assertRaises(KeyError):
+            system.rent_many([(1, 101), (9, 999), (3, 102)])
+        model.rent(1, 101)
+        self.assertSameState(system, model)
+        system.close()
+        with self.open() as system:
+            self.assertSameState(system, model)
+
+
+class TestShardedLibrarySystem(LibraryTestCase):
+    """Test cases for ShardedLibrarySystem"""
+
+    def test_against_model(self):
+        """Random single and batched operations across several shards"""
+        for seed in range(3):
+            rng = random.Random(seed)
+            entries = random_entries(rng)
+            model = Model(entries)
+            with ShardedLibrarySystem(entries, shards=3) as system:
+                for _ in range(100):
+                    self.apply(system, model, rng)
+                    self.assertSameState(system, model, f"seed={seed}")
+
+    def test_errors_propagate(self):
+        """An invalid operation in a worker is raised in the caller"""
+        with ShardedLibrarySystem([[1, 101, 5], [2, 102, 4]], shards=2) as system:
+            with self.assertRaises(KeyError):
+                system.drop(1, 101)
+            system.rent(1, 101)
+            self.assertEqual(system.report(), [[1, 101]])
+
+
+def run_tests():
+    """Run all tests and display results"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    for case in (TestIndexedLibrarySystem, TestDurableLibrarySystem, TestShardedLibrarySystem):
+        suite.addTests(loader.loadTestsFromTestCase(case))
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    exit(run_tests())
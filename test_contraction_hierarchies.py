@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Unit tests for contraction_hierarchies.py
+
+Tests cover:
+- query() and shortest_path() distances against dijkstra() on random digraphs
+- Unpacked paths use only original edges and add up to the distance
+- Tight witness-search limits, zero-weight edges and unreachable nodes
+- The same answers after save() / load()
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+from contraction_hierarchies import ContractionHierarchy
+from dijkstra import dijkstra, grid_graph
+from test_dijkstra import random_digraph
+
+INF = float('inf')
+
+
+class TestContractionHierarchy(unittest.TestCase):
+    """Test cases for ContractionHierarchy"""
+
+    def assertMatchesDijkstra(self, graph, hierarchy, message=None):
+        for source in graph:
+            expected = dijkstra(graph, source)
+            for target in graph:
+                self.assertEqual(hierarchy.query(source, target), expected[target], message)
+                distance, path = hierarchy.shortest_path(source, target)
+                self.assertEqual(distance, expected[target], message)
+                if distance == INF:
+                    self.assertEqual(path, [], message)
+                    continue
+                self.assertEqual(path[0], source, message)
+                self.assertEqual(path[-1], target, message)
+                # every hop is an original edge, so shortcuts were fully unpacked
+                self.assertEqual(sum(graph[u][v] for u, v in zip(path, path[1:])), distance, message)
+
+    def test_random_digraphs(self):
+        """Random sparse and dense digraphs, with the default and a tiny witness search"""
+        rng = random.Random(0)
+        for trial in range(80):
+            graph = random_digraph(rng, nodes=rng.randint(1, 16), edge_probability=rng.choice([0.1, 0.2, 0.4]))
+            settle_limit = rng.choice([1, 3, 500])
+            hierarchy = ContractionHierarchy.build(graph, settle_limit=settle_limit)
+            self.assertMatchesDijkstra(graph, hierarchy, f"trial={trial}, settle_limit={settle_limit}")
+
+    def test_grid(self):
+        """A small road-like grid with string labels"""
+        graph = grid_graph(8, 8, seed=1)
+        stats = {}
+        hierarchy = ContractionHierarchy.build(graph, stats=stats)
+        self.assertGreater(stats['shortcuts'], 0)
+        self.assertMatchesDijkstra(graph, hierarchy)
+
+    def test_save_load(self):
+        """A loaded hierarchy answers exactly like the one that was saved"""
+        rng = random.Random(1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hierarchy.json")
+            for trial in range(20):
+                graph = random_digraph(rng, nodes=rng.randint(2, 16), edge_probability=0.25)
+                hierarchy = ContractionHierarchy.build(graph, settle_limit=rng.choice([2, 500]))
+                hierarchy.save(path)
+                loaded = ContractionHierarchy.load(path)
+                self.assertEqual(loaded.rank, hierarchy.rank)
+                self.assertEqual(loaded.middle, hierarchy.middle)
+                self.assertMatchesDijkstra(graph, loaded, f"trial={trial}")
+
+    def test_unknown_nodes(self):
+        """Nodes that are not in the graph are unreachable"""
+        hierarchy = ContractionHierarchy.build({"a": {"b": 1}, "b": {}})
+        self.assertEqual(hierarchy.query("a", "z"), INF)
+        self.assertEqual(hierarchy.shortest_path("z", "a"), (INF, []))
+        self.assertEqual(hierarchy.shortest_path("a", "a"), (0, ["a"]))
+
+
+def run_tests():
+    """Run all tests and display results"""
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestContractionHierarchy)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    exit(run_tests())
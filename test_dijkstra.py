@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Unit tests for dijkstra.py
+
+Every search is compared with plain dijkstra() on small random digraphs
+that include zero-weight edges and unreachable nodes:
+- dijkstra_csr
+- shortest_path and bidirectional_dijkstra
+- A* and ALT (also after save/load)
+- distance_matrix
+- The Dial, radix heap and auto queues
+- DynamicShortestPaths under random increases, decreases and removals
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+from dijkstra import (ALTIndex, DynamicShortestPaths, astar, bidirectional_dijkstra, build_csr,
+                      dijkstra, dijkstra_csr, distance_matrix, reverse_graph, select_landmarks,
+                      shortest_path)
+
+INF = float('inf')
+
+
+def random_digraph(rng, nodes=12, edge_probability=0.2, max_weight=9):
+    """Small directed graph with int labels; about a fifth of the weights are zero."""
+    graph = {node: {} for node in range(nodes)}
+    for u in range(nodes):
+        for v in range(nodes):
+            if u != v and rng.random() < edge_probability:
+                graph[u][v] = 0 if rng.random() < 0.2 else rng.randint(1, max_weight)
+    return graph
+
+
+def graphs(count, seed=0, **kwargs):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield rng, random_digraph(rng, nodes=rng.randint(1, 14), **kwargs)
+
+
+class ShortestPathTestCase(unittest.TestCase):
+    def assertValidPath(self, graph, source, target, result, expected):
+        distance, path = result
+        self.assertEqual(distance, expected)
+        if expected == INF:
+            self.assertEqual(path, [])
+            return
+        self.assertEqual(path[0], source)
+        self.assertEqual(path[-1], target)
+        self.assertEqual(sum(graph[u][v] for u, v in zip(path, path[1:])), distance)
+
+
+class TestCSR(unittest.TestCase):
+    """dijkstra_csr against dijkstra()"""
+
+    def test_dijkstra_csr(self):
+        for rng, graph in graphs(100, seed=3):
+            csr = build_csr(graph)
+            for source in graph:
+                self.assertEqual(csr.to_dict(dijkstra_csr(csr, source)), dijkstra(graph, source))
+
+
+class TestPointToPoint(ShortestPathTestCase):
+    """Early-exit and bidirectional searches against dijkstra()"""
+
+    def test_against_dijkstra(self):
+        for rng, graph in graphs(150, seed=5):
+            reverse = reverse_graph(graph)
+            for source in graph:
+                expected = dijkstra(graph, source)
+                for target in graph:
+                    for result in (shortest_path(graph, source, target),
+                                   bidirectional_dijkstra(graph, source, target, reverse),
+                                   bidirectional_dijkstra(graph, source, target)):
+                        self.assertValidPath(graph, source, target, result, expected[target])
+
+    def test_missing_nodes(self):
+        """Targets outside the graph are unreachable"""
+        graph = {0: {1: 2}, 1: {}}
+        self.assertEqual(shortest_path(graph, 0, 5), (INF, []))
+        self.assertEqual(bidirectional_dijkstra(graph, 0, 5), (INF, []))
+        self.assertEqual(bidirectional_dijkstra(graph, 1, 1), (0, [1]))
+
+
+class TestALT(ShortestPathTestCase):
+    """A* and ALT landmark queries against dijkstra()"""
+
+    def test_against_dijkstra(self):
+        for rng, graph in graphs(150, seed=5):
+            reverse = reverse_graph(graph)
+            landmarks = select_landmarks(graph, 3, strategy=rng.choice(["random", "degree", "farthest"]),
+                                         reverse=reverse, seed=rng.randrange(100))
+            index = ALTIndex.build(graph, landmarks, reverse)
+            for source in graph:
+                expected = dijkstra(graph, source)
+                for target in graph:
+                    for result in (astar(graph, source, target, lambda node: 0),
+                                   index.shortest_path(graph, source, target),
+                                   index.shortest_path(graph, source, target, active=1)):
+                        self.assertValidPath(graph, source, target, result, expected[target])
+
+    def test_heuristic_is_admissible(self):
+        for rng, graph in graphs(50, seed=6):
+            index = ALTIndex.build(graph, select_landmarks(graph, 4, seed=rng.randrange(100)))
+            for source in graph:
+                distances = dijkstra(graph, source)
+                for target in graph:
+                    h = index.heuristic(target)
+                    self.assertLessEqual(h(source), distances[target])
+
+    def test_save_load(self):
+        rng = random.Random(7)
+        graph = {str(node): {str(v): w for v, w in edges.items()}
+                 for node, edges in random_digraph(rng, nodes=20).items()}
+        index = ALTIndex.build(graph, select_landmarks(graph, 3))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "alt.json")
+            index.save(path)
+            loaded = ALTIndex.load(path)
+        self.assertEqual(loaded.vectors, index.vectors)
+        for source in graph:
+            expected = dijkstra(graph, source)
+            for target in graph:
+                self.assertValidPath(graph, source, target, loaded.shortest_path(graph, source, target),
+                                     expected[target])
+
+
+class TestDistanceMatrix(unittest.TestCase):
+    """distance_matrix in-process and on a worker pool"""
+
+    def test_distance_matrix(self):
+        rng = random.Random(4)
+        graph = random_digraph(rng, nodes=30)
+        sources = rng.sample(list(graph), 6)
+        targets = rng.sample(list(graph), 10)
+        expected = [[dijkstra(graph, source)[target] for target in targets] for source in sources]
+        for workers in (1, 2):
+            self.assertEqual(distance_matrix(graph, sources, targets, workers=workers), expected)
+
+    def test_large_int_weights(self):
+        """Non-negative int weights are packed as ints, so distances above 2**53 stay exact"""
+        big = 2**53 + 1
+        graph = {"a": {"b": big}, "b": {"c": 1, "d": big}, "c": {}, "d": {}}
+        csr = build_csr(graph)
+        self.assertEqual(csr.weights.typecode, 'q')
+        distances = csr.to_dict(dijkstra_csr(csr, "a"))
+        self.assertEqual(distances, dijkstra(graph, "a"))
+        self.assertEqual(distances["c"], 2**53 + 2)
+        self.assertIs(type(distances["d"]), int)
+        for workers in (1, 2):
+            self.assertEqual(distance_matrix(graph, ["a", "b"], ["c", "d"], workers=workers),
+                             [[big + 1, 2 * big], [1, big]])
+        self.assertEqual(build_csr({"a": {"b": 0.5}, "b": {}}).weights.typecode, 'd')
+
+
+class TestQueues(unittest.TestCase):
+    """dijkstra() with every priority queue"""
+
+    def test_queues_match_heap(self):
+        for rng, graph in graphs(200, seed=1):
+            for source in graph:
+                expected = dijkstra(graph, source)
+                for queue in ("dial", "radix", "auto"):
+                    self.assertEqual(dijkstra(graph, source, queue), expected, queue)
+
+    def test_all_zero_weights(self):
+        """Dial's ring has a single bucket when every weight is zero"""
+        graph = {0: {1: 0}, 1: {2: 0}, 2: {0: 0}, 3: {}}
+        for queue in ("heap", "dial", "radix"):
+            self.assertEqual(dijkstra(graph, 0, queue), {0: 0, 1: 0, 2: 0, 3: INF})
+
+    def test_large_weights(self):
+        """Weights above DIAL_MAX_WEIGHT; auto falls back to the heap"""
+        for rng, graph in graphs(50, seed=2, max_weight=10**7):
+            expected = dijkstra(graph, 0)
+            self.assertEqual(dijkstra(graph, 0, "radix"), expected)
+            self.assertEqual(dijkstra(graph, 0, "auto"), expected)
+
+    def test_unknown_queue(self):
+        with self.assertRaises(ValueError):
+            dijkstra({0: {}}, 0, "fibonacci")
+
+
+class TestDynamicShortestPaths(unittest.TestCase):
+    """DynamicShortestPaths against a recomputation after every update"""
+
+    def assertConsistent(self, dynamic, model, source, message):
+        expected = dijkstra(model, source)
+        self.assertEqual(dynamic.distances, expected, message)
+        # the kept tree only uses tight edges and reaches exactly the reachable nodes
+        for node, distance in expected.items():
+            parent = dynamic.parent.get(node)
+            if node == source:
+                self.assertIsNone(parent, message)
+            elif distance == INF:
+                self.assertNotIn(node, dynamic.parent, message)
+            else:
+                self.assertEqual(dynamic.distances[parent] + model[parent][node], distance, message)
+                self.assertIn(node, dynamic.children[parent], message)
+
+    def test_random_updates(self):
+        for seed, (rng, graph) in enumerate(graphs(150, seed=8, edge_probability=0.25)):
+            nodes = list(graph)
+            model = {node: dict(edges) for node, edges in graph.items()}
+            source = rng.choice(nodes)
+            dynamic = DynamicShortestPaths(graph, source)
+            self.assertConsistent(dynamic, model, source, f"seed={seed}, initial")
+            for step in range(40):
+                edges = [(u, v) for u in model for v in model[u]]
+                kind = rng.random()
+                if edges and kind < 0.3:
+                    u, v = rng.choice(edges)
+                    weight = model[u][v] + rng.randint(1, 5)  # increase
+                elif edges and kind < 0.6:
+                    u, v = rng.choice(edges)
+                    weight = rng.randint(0, model[u][v])      # decrease, possibly to zero
+                elif edges and kind < 0.8:
+                    u, v = rng.choice(edges)
+                    weight = None                             # removal
+                else:
+                    u, v = rng.choice(nodes), rng.choice(nodes + [len(nodes)])
+                    if u == v:
+                        continue
+                    weight = rng.randint(0, 9)                # new edge, maybe to a new node
+                if weight is None:
+                    del model[u][v]
+                else:
+                    model.setdefault(v, {})
+                    model[u][v] = weight
+                dynamic.update_edge(u, v, weight)
+                self.assertConsistent(dynamic, model, source, f"seed={seed}, step={step}, {(u, v, weight)}")
+
+    def test_seeded_distances(self):
+        """Starting from precomputed distances gives the same tree as computing them"""
+        rng = random.Random(9)
+        graph = random_digraph(rng, nodes=15)
+        dynamic = DynamicShortestPaths(graph, 0, distances=dijkstra(graph, 0))
+        self.assertConsistent(dynamic, graph, 0, "seeded")
+        dynamic.update_edges([(0, v, None) for v in list(graph[0])])
+        self.assertEqual(dynamic.distances, {node: 0 if node == 0 else INF for node in graph})
+
+
+def run_tests():
+    """Run all tests and display results"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    for case in (TestCSR, TestPointToPoint, TestALT, TestDistanceMatrix, TestQueues, TestDynamicShortestPaths):
+        suite.addTests(loader.loadTestsFromTestCase(case))
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    exit(run_tests())
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Unit tests for "Task Scheduler with Priority and Dependencies"
+
+Tests cover:
+- Priority order and dependency unlocking
+- Completing a task twice
+- change_priority and cancel_task against a brute-force model
+- The critical_path policy against a brute-force rank model, and simulate()
+- execute and execute_async: dependency order, results, failures and the report
+"""
+
+import asyncio
+import functools
+import os
+import random
+import unittest
+from importlib.machinery import SourceFileLoader
+from importlib.util import module_from_spec, spec_from_loader
+
+# the script has no .py extension, so import it through an explicit loader
+_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Task Scheduler with Priority and Dependencies")
+_loader = SourceFileLoader("task_scheduler", _path)
+task_scheduler = module_from_spec(spec_from_loader("task_scheduler", _loader))
+_loader.exec_module(task_scheduler)
+
+TaskScheduler = task_scheduler.TaskScheduler
+IndexedPriorityQueue = task_scheduler.IndexedPriorityQueue
+ExecutionReport = task_scheduler.ExecutionReport
+
+
+def drain(scheduler):
+    """Hand out and complete tasks until none are ready; returns the order."""
+    order = []
+    while True:
+        task_id = scheduler.next_task()
+        if task_id is None:
+            return order
+        order.append(task_id)
+        scheduler.complete_task(task_id)
+
+
+class TestTaskScheduler(unittest.TestCase):
+    """Test cases for TaskScheduler"""
+
+    def test_example(self):
+        """The example from the script's __main__"""
+        scheduler = TaskScheduler(verbose=False)
+        scheduler.add_task("T1", 5)
+        scheduler.add_task("T2", 10, ["T1"])
+        scheduler.add_task("T3", 7)
+        self.assertEqual(drain(scheduler), ["T3", "T1", "T2"])
+
+    def test_unknown_dependency(self):
+        """A missing dependency is rejected and the task is not added"""
+        scheduler = TaskScheduler(verbose=False)
+        with self.assertRaises(ValueError):
+            scheduler.add_task("A", 1, ["missing"])
+        self.assertNotIn("A", scheduler.tasks)
+
+    def test_complete_twice(self):
+        """Completing a task again does not queue its dependents a second time"""
+        scheduler = TaskScheduler(verbose=False)
+        scheduler.add_task("A", 5)
+        others = [f"T{i}" for i in range(10)]
+        for i, task_id in enumerate(others):
+            scheduler.add_task(task_id, i)
+        scheduler.add_task("B", 1, ["A"])
+        scheduler.complete_task("A")
+        scheduler.complete_task("A")
+        self.assertEqual(len(scheduler.available_tasks), 11)
+        order = drain(scheduler)
+        self.assertEqual(order.count("B"), 1)
+        self.assertEqual(sorted(order), sorted(others + ["B"]))
+
+    def test_queue_rejects_duplicates(self):
+        """push refuses a task_id that is already queued"""
+        queue = IndexedPriorityQueue()
+        queue.push("A", 1)
+        with self.assertRaises(ValueError):
+            queue.push("A", 2)
+        self.assertEqual(len(queue), 1)
+
+    def test_against_model(self):
+        """Random adds, completions, priority changes and cancels against a brute-force model"""
+        for seed in range(100):
+            rng = random.Random(seed)
+            scheduler = TaskScheduler(verbose=False)
+            priority, dependencies, done = {}, {}, set()
+            handed = set()
+            for task_id in range(60):
+                operation = rng.random()
+                live = [t for t in priority if t not in done]
+                if operation < 0.5 or not live:
+                    deps = rng.sample(sorted(priority), min(len(priority), rng.randint(0, 2)))
+                    priority[task_id] = rng.randint(1, 20)
+                    dependencies[task_id] = set(deps)
+                    scheduler.add_task(task_id, priority[task_id], deps)
+                elif operation < 0.65:
+                    target = rng.choice(live)
+                    priority[target] = rng.randint(1, 20)
+                    scheduler.change_priority(target, priority[target])
+                elif operation < 0.75:
+                    target = rng.choice(live)
+                    cancelled = {target}
+                    changed = True
+                    while changed:
+                        changed = False
+                        for t in priority:
+                            if t not in cancelled and t not in done and dependencies[t] & cancelled:
+                                cancelled.add(t)
+                                changed = True
+                    self.assertEqual(set(scheduler.cancel_task(target)), cancelled)
+                    for t in cancelled:
+                        del priority[t], dependencies[t]
+                        handed.discard(t)
+                else:
+                    ready = [t for t in priority if t not in done and t not in handed
+                             and dependencies[t] <= done]
+                    got = scheduler.next_task()
+                    if not ready:
+                        self.assertIsNone(got)
+                        continue
+                    self.assertIn(got, ready)
+                    self.assertEqual(priority[got], max(priority[t] for t in ready))
+                    handed.add(got)
+                    if rng.random() < 0.7:
+                        scheduler.complete_task(got)
+                        done.add(got)
+                        handed.discard(got)
+            self.assertEqual(set(scheduler.tasks), set(priority), f"seed={seed}")
+
+
+class TestCriticalPath(unittest.TestCase):
+    """Test cases for the critical_path policy"""
+
+    def test_against_model(self):
+        """next_task returns a ready task with the largest (rank, priority) after any operation"""
+        for seed in range(100):
+            rng = random.Random(seed)
+            scheduler = TaskScheduler(verbose=False, policy="critical_path")
+            priority, duration, dependencies, done, handed = {}, {}, {}, set(), set()
+
+            def rank(task_id):
+                # tasks are added after their dependencies, so ids grow along every chain
+                return duration[task_id] + max((rank(t) for t in priority if task_id in dependencies[t]),
+                                               default=0)
+
+            for task_id in range(60):
+                operation = rng.random()
+                live = [t for t in priority if t not in done]
+                if operation < 0.5 or not live:
+                    deps = rng.sample(sorted(priority), min(len(priority), rng.randint(0, 2)))
+                    priority[task_id] = rng.randint(1, 5)
+                    duration[task_id] = rng.randint(1, 5)
+                    dependencies[task_id] = set(deps)
+                    scheduler.add_task(task_id, priority[task_id], deps, duration[task_id])
+                elif operation < 0.6:
+                    target = rng.choice(live)
+                    priority[target] = rng.randint(1, 5)
+                    scheduler.change_priority(target, priority[target])
+                elif operation < 0.7:
+                    target = rng.choice(live)
+                    for t in scheduler.cancel_task(target):
+                        del priority[t], duration[t], dependencies[t]
+                        handed.discard(t)
+                else:
+                    ready = [t for t in priority if t not in done and t not in handed
+                             and dependencies[t] <= done]
+                    got = scheduler.next_task()
+                    if not ready:
+                        self.assertIsNone(got)
+                        continue
+                    self.assertIn(got, ready)
+                    self.assertEqual((rank(got), priority[got]), max((rank(t), priority[t]) for t in ready),
+                                     f"seed={seed}, task_id={task_id}")
+                    handed.add(got)
+                    if rng.random() < 0.7:
+                        scheduler.complete_task(got)
+                        done.add(got)
+                        handed.discard(got)
+
+    def test_simulate(self):
+        """The long chain starts first, so two workers finish at the critical path length"""
+        durations = {"A": 3, "B": 3, "C": 3, "W": 2, "X": 2, "Y": 2, "Z": 2}
+        makespans = {}
+        for policy in TaskScheduler.POLICIES:
+            scheduler = TaskScheduler(verbose=False, policy=policy)
+            scheduler.add_task("A", 1, [], 3)
+            scheduler.add_task("B", 1, ["A"], 3)
+            scheduler.add_task("C", 1, ["B"], 3)
+            for task_id in "WXYZ":
+                scheduler.add_task(task_id, 10, [], 2)
+            makespans[policy] = task_scheduler.simulate(scheduler, durations, workers=2)
+        self.assertEqual(makespans, {"priority": 13, "critical_path": 9})
+
+
+def scheduler_for(dag):
+    scheduler = TaskScheduler(verbose=False)
+    for task_id, priority, dependencies, _ in dag:
+        scheduler.add_task(task_id, priority, dependencies)
+    return scheduler
+
+
+def dependents(dag, failed):
+    """Every task that transitively depends on one of `failed`."""
+    out = set()
+    for task_id, _, dependencies, _ in dag:
+        if set(dependencies) & (out | failed):
+            out.add(task_id)
+    return out
+
+
+def boom():
+    raise RuntimeError("boom")
+
+
+async def async_boom():
+    raise RuntimeError("boom")
+
+
+async def async_value(value):
+    await asyncio.sleep(0)
+    return value
+
+
+class TestExecute(unittest.TestCase):
+    """Test cases for execute, execute_async and ExecutionReport"""
+
+    def assertRespectsDependencies(self, dag, report):
+        for task_id, _, dependencies, _ in dag:
+            if task_id in report.timeline:
+                start = report.timeline[task_id][0]
+                for dep in dependencies:
+                    self.assertLessEqual(report.timeline[dep][1], start, (dep, task_id))
+
+    def test_execute(self):
+        """Every task runs once, after its dependencies, with its result recorded"""
+        dag = task_scheduler.random_dag(80, seed=1)
+        for workers in (1, 4):
+            report = task_scheduler.execute(scheduler_for(dag), {t: functools.partial(abs, -t) for t, *_ in dag},
+                                            workers)
+            self.assertEqual(report.results, {t: t for t, *_ in dag})
+            self.assertEqual((report.errors, report.cancelled), ({}, []))
+            self.assertRespectsDependencies(dag, report)
+            self.assertGreater(report.makespan, 0)
+            self.assertTrue(0 < report.utilisation <= 1, report.utilisation)
+
+    def test_failure_cancels_dependents(self):
+        """A task that raises is in errors, its dependents are cancelled and the rest still run"""
+        dag = task_scheduler.random_dag(60, seed=2, window=10)
+        failed = {5, 17}
+        cancelled = dependents(dag, failed)
+        callables = {t: boom if t in failed else functools.partial(abs, t) for t, *_ in dag}
+        report = task_scheduler.execute(scheduler_for(dag), callables, workers=3)
+        self.assertEqual(set(report.errors), failed)
+        self.assertTrue(all(isinstance(error, RuntimeError) for error in report.errors.values()))
+        self.assertEqual(set(report.cancelled), cancelled)
+        self.assertEqual(set(report.results), {t for t, *_ in dag} - failed - cancelled)
+        self.assertRespectsDependencies(dag, report)
+
+    def test_missing_function_is_an_error(self):
+        """A task the pool cannot start is recorded instead of escaping from execute"""
+        dag = [("a", 1, [], 0), ("b", 1, ["a"], 0), ("c", 2, [], 0)]
+        report = task_scheduler.execute(scheduler_for(dag), {"c": functools.partial(abs, -3)}, workers=2)
+        self.assertIsInstance(report.errors["a"], KeyError)
+        self.assertEqual((report.results, report.cancelled), ({"c": 3}, ["b"]))
+
+    def test_process_pool_needs_picklable_functions(self):
+        """This module is loaded without an importable name, so nothing is handed out"""
+        scheduler = scheduler_for([("a", 1, [], 0)])
+        with self.assertRaises(ValueError):
+            task_scheduler.execute(scheduler, {"a": functools.partial(abs, 1)}, pool="process")
+        self.assertEqual(scheduler.next_task(), "a")
+
+    def test_execute_async(self):
+        """The asyncio executor gives the same results, failures and cancellations"""
+        dag = task_scheduler.random_dag(60, seed=3, window=10)
+        failed = {4}
+        functions = {t: async_boom if t in failed else functools.partial(async_value, t) for t, *_ in dag}
+        report = asyncio.run(task_scheduler.execute_async(scheduler_for(dag), functions, workers=4))
+        cancelled = dependents(dag, failed)
+        self.assertEqual(set(report.errors), failed)
+        self.assertEqual(set(report.cancelled), cancelled)
+        self.assertEqual(report.results, {t: t for t, *_ in dag if t not in failed | cancelled})
+        self.assertRespectsDependencies(dag, report)
+
+    def test_report(self):
+        """utilisation is busy time over workers * makespan"""
+        report = ExecutionReport(workers=2)
+        self.assertEqual(report.utilisation, 0.0)
+        report.timeline = {"a": (0.0, 2.0), "b": (0.0, 1.0), "c": (2.0, 3.0)}
+        report.makespan = 4.0
+        self.assertAlmostEqual(report.utilisation, 0.5)
+        self.assertIn("utilisation 50% of 2 workers", str(report))
+
+
+def run_tests():
+    """Run all tests and display results"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    for case in (TestTaskScheduler, TestCriticalPath, TestExecute):
+        suite.addTests(loader.loadTestsFromTestCase(case))
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    exit(run_tests())